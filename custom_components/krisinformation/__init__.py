@@ -1,73 +1,87 @@
-import asyncio
+import heapq
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
-import async_timeout
-import re
-from aiohttp import ClientError, ClientResponseError
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import __version__ as HA_VERSION
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
+from .alert_store import referenced_identifiers
+from .event_dispatcher import get_event_dispatcher
+from .filters import AlertFilter
 from .frontend import async_setup_frontend
+from .hub import (
+    KrisinformationFetchHub,
+    async_get_hub,
+    async_release_hub,
+)
+from .models import Alert, changed_fields
+from .scheduler import PollBounds
+from .websocket_api import async_setup_websocket
 from .const import (
     ACTIVE_ONLY_DEFAULT,
     API_ENV_PRODUCTION,
-    API_ENV_TEST,
     CONF_ACTIVE_ONLY,
     CONF_API_ENV,
+    CONF_AREAS,
+    CONF_CATEGORIES,
+    CONF_CERTAINTY,
     CONF_INCLUDE_UPDATE_CANCEL,
     CONF_LANGUAGE,
+    CONF_LOCATION_ZONE,
+    CONF_MAX_UPDATE_INTERVAL,
+    CONF_MIN_UPDATE_INTERVAL,
     CONF_MUNICIPALITY,
     CONF_SEVERITY_MIN,
     CONF_UPDATE_INTERVAL,
+    CONF_URGENCY,
     COUNTY_MAPPING,
-    DEFAULT_TIMEOUT_SECONDS,
     DOMAIN,
     EVENT_CANCELED_ALERT,
+    EVENT_CHANGED_ALERT,
     EVENT_NEW_ALERT,
     EVENT_UPDATED_ALERT,
     INCLUDE_UPDATE_CANCEL_DEFAULT,
-    INTEGRATION_VERSION,
     LANGUAGE_DEFAULT,
+    LOCATION_HOME_ZONE,
+    LOCATION_OFF,
+    MAX_UPDATE_INTERVAL_DEFAULT_SECONDS,
+    MIN_UPDATE_INTERVAL_DEFAULT_SECONDS,
     MUNICIPALITY_DEFAULT,
     MUNICIPALITY_MAPPING,
-    PRODUCTION_BASE_URL,
     SEVERITY_MIN_DEFAULT,
     SEVERITY_ORDER,
-    TEST_BASE_URL,
+    STORAGE_SAVE_DELAY_SECONDS,
+    STORAGE_VERSION,
     UPDATE_INTERVAL_DEFAULT_SECONDS,
-    USER_AGENT_PRODUCT,
 )
 
 _LOGGER = logging.getLogger(__name__)
-DEFAULT_UPDATE_INTERVAL = 300  # 5 minuter
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-_RE_WHITESPACE = re.compile(r"\s+")
-
-
-def _sanitize_text(value: Optional[str]) -> Optional[str]:
-    """Normalize text from SR VMA API (CRLF/newlines/odd whitespace)."""
-    if value is None:
-        return None
-    if not isinstance(value, str):
-        # Defensive: keep non-string as-is rather than crashing
-        return value  # type: ignore[return-value]
-
-    # Normalize newlines: CRLF/CR -> LF
-    text = value.replace("\r\n", "\n").replace("\r", "\n")
-
-    # Normalize any whitespace (spaces, tabs, newlines) into a single space
-    # This avoids odd-looking multiline rendering in HA attributes.
-    text = _RE_WHITESPACE.sub(" ", text)
-    return text.strip()
+# Options applied in place; changing anything else reloads the entry
+HOT_OPTIONS = frozenset(
+    {
+        CONF_LANGUAGE,
+        CONF_INCLUDE_UPDATE_CANCEL,
+        CONF_SEVERITY_MIN,
+        CONF_URGENCY,
+        CONF_CERTAINTY,
+        CONF_CATEGORIES,
+        CONF_AREAS,
+        CONF_LOCATION_ZONE,
+        CONF_UPDATE_INTERVAL,
+        CONF_MIN_UPDATE_INTERVAL,
+        CONF_MAX_UPDATE_INTERVAL,
+    }
+)
 
 
 def _get_geocode(selected: Optional[str]) -> str:
@@ -78,24 +92,73 @@ def _get_geocode(selected: Optional[str]) -> str:
     return MUNICIPALITY_MAPPING.get(selected, "")
 
 
+def _get_geocodes(selected: Optional[str], areas: Any) -> FrozenSet[str]:
+    """Return the SCB codes of the entry's municipality and extra areas.
+
+    `areas` is a list of municipality/county names or a comma-separated
+    string. The whole country ("") replaces any other area.
+    """
+    if isinstance(areas, str):
+        areas = [name.strip() for name in areas.split(",") if name.strip()]
+    codes = {_get_geocode(selected)}
+    for name in areas or []:
+        code = _get_geocode(name)
+        if code or name == MUNICIPALITY_DEFAULT:
+            codes.add(code)
+        else:
+            _LOGGER.warning("Okänt område ignoreras: %s", name)
+    if "" in codes:
+        return frozenset({""})
+    return frozenset(codes)
+
+
 async def async_setup(hass, config):
     await async_setup_frontend(hass)
+    async_setup_websocket(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
-    session = async_get_clientsession(hass)
-    coordinator = KrisinformationDataUpdateCoordinator(
-        hass, session, entry, timedelta(seconds=DEFAULT_UPDATE_INTERVAL)
+    started = time.monotonic()
+    coordinator = KrisinformationDataUpdateCoordinator(hass, entry)
+    hub = coordinator.hub
+    hub.attach_entry(
+        entry.entry_id,
+        coordinator.poll_bounds(),
+        coordinator.geocodes,
+        coordinator.language,
     )
-    await coordinator.async_config_entry_first_refresh()
+
+    # Restore validators, alert set and seen alerts so entities start from the
+    # last known state and the first request is conditional. Setup never waits
+    # for the VMA API; its cost is bounded by reading the local store.
+    await coordinator.async_restore()
+    coordinator.async_prime()
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
+    # Follow the shared hub; adding the listener starts its polling schedule
+    entry.async_on_unload(hub.async_add_listener(coordinator.handle_hub_update))
+    entry.async_on_unload(coordinator.async_close)
+
     await hass.config_entries.async_forward_entry_setups(
         entry, ["sensor", "binary_sensor"]
     )
 
+    # First fetch runs in the background, once per hub
+    entry.async_create_background_task(
+        hass,
+        hub.async_startup_refresh(),
+        f"{DOMAIN} first refresh ({hub.api_env})",
+    )
+    coordinator.setup_seconds = time.monotonic() - started
+    _LOGGER.debug(
+        "Setup of %s finished in %.3f s", entry.title, coordinator.setup_seconds
+    )
+
     async def _options_update_listener(hass: HomeAssistant, updated_entry: ConfigEntry):
+        coordinator = hass.data.get(DOMAIN, {}).get(updated_entry.entry_id)
+        if coordinator is not None and coordinator.async_apply_options():
+            return
         await hass.config_entries.async_reload(updated_entry.entry_id)
 
     entry.async_on_unload(entry.add_update_listener(_options_update_listener))
@@ -107,10 +170,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
         entry, ["sensor", "binary_sensor"]
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_persist()
+        coordinator.hub.detach_entry(entry.entry_id)
+        await async_release_hub(hass, coordinator.hub)
+        if not hass.data[DOMAIN]:
+            get_event_dispatcher(hass).async_shutdown()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted state of a deleted entry."""
+    await _entry_store(hass, entry.entry_id).async_remove()
+
+
+def _entry_store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.entry_{entry_id}")
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate old entry to the latest version."""
     if entry.version == 1:
@@ -152,32 +229,109 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 class KrisinformationDataUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, session, config_entry, update_interval):
+    """Per-entry view of the shared fetch hub.
+
+    The coordinator does not poll by itself; it derives its data from the
+    hub's national alert set whenever the hub updates, filtering locally by
+    the entry's area geocodes and options.
+    """
+
+    def __init__(self, hass, config_entry):
         super().__init__(
             hass,
             _LOGGER,
             name="Krisinformation Data Update Coordinator",
-            update_interval=update_interval,
+            update_interval=None,
             config_entry=config_entry,
+            # Changes are published by _async_publish; a refresh that
+            # returns the same data must not notify listeners again
+            always_update=False,
         )
-        self.session = session
         self.config_entry = config_entry
         self.config = config_entry.data
         self.options = config_entry.options
+        self.hub: KrisinformationFetchHub = async_get_hub(
+            hass, self._get_effective_option(CONF_API_ENV, API_ENV_PRODUCTION)
+        )
+        self._geocodes = _get_geocodes(
+            self.config.get(CONF_MUNICIPALITY, MUNICIPALITY_DEFAULT),
+            self._get_effective_option(CONF_AREAS, []),
+        )
 
-        # Caching / conditional requests
-        self._etag: Optional[str] = None
-        self._last_modified: Optional[str] = None
-        self._since_iso: Optional[str] = None
-
-        # State tracking for events
+        # State tracking for events, persisted across restarts
         self._identifier_to_msgtype: Dict[str, str] = {}
-        self._last_alert_sent: Optional[str] = None
+        # Content digests of the same alerts, see Alert.digests
+        self._identifier_to_digests: Dict[str, bytes] = {}
+        self._persist = _entry_store(hass, config_entry.entry_id)
+        # Compiled once from the options; see filters.AlertFilter
+        self._filter = AlertFilter.from_options(self._get_effective_option)
+        # Events are fired once per alert across entries, see event_dispatcher
+        self._events = get_event_dispatcher(hass)
+        self.setup_seconds: Optional[float] = None
+        self.last_process_ms: Optional[float] = None
+
+        # Upcoming effective/onset/expires instants of the entry's alerts; the
+        # earliest one has a timer that re-filters locally without polling
+        self._boundaries: List[datetime] = []
+        self._unsub_boundary: Optional[Callable[[], None]] = None
+
+        # Fingerprint of the published alert set, see _async_publish()
+        self._fingerprint: Optional[Tuple[Tuple[Any, ...], ...]] = None
+        self.skipped_updates = 0
+        # Added/updated/removed alerts of the update being published; only
+        # set while listeners are notified (see websocket subscriptions)
+        self.last_delta: Optional[Dict[str, Any]] = None
+        self._close_callbacks: List[Callable[[], None]] = []
+
+        # Serialized alerts for the current data, see alert_attributes()
+        self._attributes_source: Optional[Dict[str, Any]] = None
+        self._attributes: List[Dict[str, Any]] = []
+        self._summary: List[Dict[str, Any]] = []
+        self._aggregates: Dict[str, Any] = self._alert_aggregates([])
+
+    async def async_restore(self) -> None:
+        """Load persisted event state and the hub cache."""
+        await self.hub.async_restore()
+        try:
+            stored = await self._persist.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Kunde inte läsa sparat tillstånd: %s", err)
+            return
+        if stored:
+            self._identifier_to_msgtype = dict(stored.get("seen") or {})
+            for identifier, digests in (stored.get("digests") or {}).items():
+                try:
+                    self._identifier_to_digests[identifier] = bytes.fromhex(digests)
+                except (TypeError, ValueError):
+                    continue
+
+    @callback
+    def _data_to_persist(self) -> Dict[str, Any]:
+        return {
+            "seen": self._identifier_to_msgtype,
+            "digests": {i: d.hex() for i, d in self._identifier_to_digests.items()},
+        }
+
+    async def async_persist(self) -> None:
+        """Write the event state now instead of after the save delay.
 
-        self._user_agent = self._compose_user_agent()
+        A reload reads the store right away; a pending delayed write of the
+        old coordinator would leave it a stale `seen` map.
+        """
+        await self._persist.async_save(self._data_to_persist())
 
-        # Store default interval for backoff recovery
-        self._default_update_interval = update_interval
+    @callback
+    def async_prime(self) -> None:
+        """Seed data from the hub's restored snapshot without a network call.
+
+        Without a snapshot the entities start unavailable until the hub's
+        first fetch completes.
+        """
+        if self.hub.data is None:
+            self.last_update_success = False
+            return
+        self.data = self._process_hub_data()
+        self._fingerprint = self._alert_fingerprint(self.data["alerts"])
 
     def _get_effective_option(self, key: str, default: Any) -> Any:
         # Prefer options; fallback to original data for first-time setup values
@@ -185,311 +339,366 @@ class KrisinformationDataUpdateCoordinator(DataUpdateCoordinator):
             return self.options.get(key)
         return self.config.get(key, default)
 
-    def _get_language(self) -> str:
-        return self._get_effective_option(CONF_LANGUAGE, LANGUAGE_DEFAULT)
+    @property
+    def language(self) -> str:
+        return self._get_language()
 
-    def _get_filters(self) -> Dict[str, Any]:
-        return {
-            "active_only": True,  # Always enforce active-only per design
-            "include_update_cancel": self._get_effective_option(
-                CONF_INCLUDE_UPDATE_CANCEL, INCLUDE_UPDATE_CANCEL_DEFAULT
+    @property
+    def geocodes(self) -> FrozenSet[str]:
+        """SCB codes of the entry's areas, {""} for the whole country."""
+        return self._geocodes
+
+    def poll_bounds(self) -> PollBounds:
+        return PollBounds(
+            self._get_effective_option(
+                CONF_MIN_UPDATE_INTERVAL, MIN_UPDATE_INTERVAL_DEFAULT_SECONDS
             ),
-            "severity_min": self._get_effective_option(
-                CONF_SEVERITY_MIN, SEVERITY_MIN_DEFAULT
+            self._get_effective_option(
+                CONF_UPDATE_INTERVAL, UPDATE_INTERVAL_DEFAULT_SECONDS
             ),
-        }
+            self._get_effective_option(
+                CONF_MAX_UPDATE_INTERVAL, MAX_UPDATE_INTERVAL_DEFAULT_SECONDS
+            ),
+        )
 
-    def _compose_url_and_params(self) -> Tuple[str, Dict[str, str]]:
-        selected = self.config.get(CONF_MUNICIPALITY, MUNICIPALITY_DEFAULT)
-        geocode = _get_geocode(selected)
-        # Determine API environment
-        env = self._get_effective_option(CONF_API_ENV, API_ENV_PRODUCTION)
-        url = TEST_BASE_URL if env == API_ENV_TEST else PRODUCTION_BASE_URL
-        params: Dict[str, str] = {}
-        if geocode:
-            params["geocode"] = geocode
-        if self._since_iso:
-            params["since"] = self._since_iso
-        return url, params
-
-    def _compose_user_agent(self) -> str:
-        integration_version = INTEGRATION_VERSION or "0.0.0"
-        ha_version = HA_VERSION or "unknown"
-        ua = f"{USER_AGENT_PRODUCT}/{integration_version}"
-        if ha_version:
-            ua = f"{ua} HomeAssistant/{ha_version}"
-        return ua
-
-    def _build_headers(self) -> Dict[str, str]:
-        headers = {"User-Agent": self._user_agent, "Accept": "application/json"}
-        if self._etag:
-            headers["If-None-Match"] = self._etag
-        if self._last_modified:
-            headers["If-Modified-Since"] = self._last_modified
-        return headers
+    def _get_language(self) -> str:
+        return self._get_effective_option(CONF_LANGUAGE, LANGUAGE_DEFAULT)
 
-    async def _async_update_data(self):
-        url, params = self._compose_url_and_params()
-        headers = self._build_headers()
-        try:
-            async with async_timeout.timeout(DEFAULT_TIMEOUT_SECONDS):
-                async with self.session.get(
-                    url, params=params, headers=headers
-                ) as response:
-                    if response.status == 304:
-                        # Not modified: return previous data
-                        _LOGGER.debug("304 Not Modified from VMA API")
-                        return self.data or {}
-
-                    if response.status == 429:
-                        retry_after = response.headers.get("Retry-After")
-                        _LOGGER.warning(
-                            "429 Too Many Requests from VMA API, Retry-After=%s",
-                            retry_after,
-                        )
-                        # Use Retry-After if provided, otherwise exponential backoff
-                        if retry_after:
-                            try:
-                                wait_seconds = int(retry_after)
-                            except ValueError:
-                                wait_seconds = self.update_interval.total_seconds() * 2
-                        else:
-                            wait_seconds = self.update_interval.total_seconds() * 2
-                        self.update_interval = timedelta(seconds=min(900, wait_seconds))
-                        return self.data or {}
-
-                    response.raise_for_status()
-
-                    # Capture caching headers
-                    self._etag = response.headers.get("ETag") or self._etag
-                    self._last_modified = (
-                        response.headers.get("Last-Modified") or self._last_modified
-                    )
-                    cache_control = response.headers.get("Cache-Control", "")
-
-                    # Adjust polling interval if max-age present
-                    if "max-age=" in cache_control:
-                        try:
-                            max_age = int(
-                                cache_control.split("max-age=")[1].split(",")[0]
-                            )
-                            # Keep sensible bounds
-                            self.update_interval = timedelta(
-                                seconds=max(60, min(600, max_age))
-                            )
-                        except Exception:  # noqa: BLE001
-                            pass
-                    elif self.update_interval > self._default_update_interval:
-                        # Gradually recover from backoff after successful request
-                        recovered_seconds = max(
-                            self._default_update_interval.total_seconds(),
-                            self.update_interval.total_seconds() / 2,
-                        )
-                        self.update_interval = timedelta(seconds=recovered_seconds)
-                        _LOGGER.debug(
-                            "Recovering from backoff, interval now %s seconds",
-                            recovered_seconds,
-                        )
-
-                    data = await response.json()
-        except asyncio.TimeoutError as err:
-            _LOGGER.warning(
-                "Timeout vid anrop till VMA API (tidsgräns %ss)",
-                DEFAULT_TIMEOUT_SECONDS,
-            )
-            raise UpdateFailed("API-anrop tog för lång tid") from err
-        except ClientResponseError as err:
-            _LOGGER.warning(
-                "HTTP-fel %s vid anrop till VMA API: %s", err.status, err.message
-            )
-            raise UpdateFailed(f"HTTP-fel {err.status}: {err.message}") from err
-        except ClientError as err:
-            _LOGGER.warning("Nätverksfel vid anrop till VMA API: %s", err)
-            raise UpdateFailed(f"Nätverksfel: {err}") from err
-        except Exception as err:  # noqa: BLE001
-            _LOGGER.exception("Oväntat fel vid anrop till VMA API")
-            raise UpdateFailed(f"Oväntat fel: {err}") from err
+    def _get_location(self) -> Optional[Tuple[float, float]]:
+        """Return the (latitude, longitude) to match alerts against, if any."""
+        zone = self._get_effective_option(CONF_LOCATION_ZONE, LOCATION_OFF)
+        if not zone or zone == LOCATION_OFF:
+            return None
+        state = self.hass.states.get(zone)
+        if state is not None:
+            latitude = state.attributes.get("latitude")
+            longitude = state.attributes.get("longitude")
+            if latitude is not None and longitude is not None:
+                return float(latitude), float(longitude)
+        if zone == LOCATION_HOME_ZONE:
+            return self.hass.config.latitude, self.hass.config.longitude
+        _LOGGER.debug("Zonen %s saknar position, filtrerar på område", zone)
+        return None
 
-        # Normalize and filter
+    async def _async_update_data(self):
+        await self.hub.async_ensure_data()
+        # Same path as hub updates so last_delta and the fingerprint follow
+        self._async_publish(self._process_hub_data())
+        return self.data
+
+    @callback
+    def async_apply_options(self) -> bool:
+        """Apply changed options without reloading the entry.
+
+        Returns False when the entry data or the effective value of an
+        option outside `HOT_OPTIONS` changed; the caller reloads the entry
+        then. Otherwise the cached alert set is filtered again and
+        published, without an API request.
+        """
+        entry = self.config_entry
+        if dict(entry.data) != dict(self.config):
+            return False
+        old, new, data = dict(self.options), dict(entry.options), self.config
+        # Compare what _get_effective_option returns: an option copied from
+        # data by the first options save is not a change
+        changed = {
+            key
+            for key in old.keys() | new.keys()
+            if old.get(key, data.get(key)) != new.get(key, data.get(key))
+        }
+        if not changed.issubset(HOT_OPTIONS):
+            return False
+        started = time.perf_counter()
         language = self._get_language()
-        filters = self._get_filters()
-        normalized = self._normalize_data(data, language)
-        active_alerts = self._apply_filters(normalized, filters)
+        self.options = entry.options
+        if self._get_language() != language:
+            # Digests depend on the language; don't report that as changes
+            self._identifier_to_digests = {}
+        self._filter = AlertFilter.from_options(self._get_effective_option)
+        self._geocodes = _get_geocodes(
+            self.config.get(CONF_MUNICIPALITY, MUNICIPALITY_DEFAULT),
+            self._get_effective_option(CONF_AREAS, []),
+        )
+        self.hub.attach_entry(
+            entry.entry_id, self.poll_bounds(), self._geocodes, self._get_language()
+        )
+        if self.hub.data is not None and self.hub.last_update_success:
+            self._async_publish(self._process_hub_data())
+        _LOGGER.debug(
+            "Inställningar %s för %s tillämpade utan omladdning på %.2f ms",
+            sorted(changed),
+            entry.title,
+            (time.perf_counter() - started) * 1000,
+        )
+        return True
+
+    @callback
+    def handle_hub_update(self) -> None:
+        """Recompute entry data after the shared hub refreshed."""
+        if not self.hub.last_update_success:
+            self.async_set_update_error(
+                self.hub.last_exception or UpdateFailed("VMA API-anrop misslyckades")
+            )
+            return
+        started = time.perf_counter()
+        self._async_publish(self._process_hub_data())
+        # Event-loop time spent on this entry for the cycle
+        self.last_process_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    @staticmethod
+    def _alert_fingerprint(alerts: List[Alert]) -> Tuple[Tuple[Any, ...], ...]:
+        # Identity fields plus the content hash, which also catches content
+        # changed without a new msgType
+        return tuple(
+            (a.identifier, a.msg_type, a.sent_iso, a.content_hash) for a in alerts
+        )
 
-        # Emit events comparing with last state (always, regardless of sensor filters)
-        self._emit_events(previous=self._identifier_to_msgtype, current=normalized)
-        # Update internal map for next diff
-        self._identifier_to_msgtype = {
-            a["identifier"]: a.get("msgType", "") for a in normalized
+    @callback
+    def _async_publish(self, data: Dict[str, Any]) -> None:
+        """Notify entities only if the filtered alert set changed."""
+        fingerprint = self._alert_fingerprint(data["alerts"])
+        if (
+            self.last_update_success
+            and self.data is not None
+            and fingerprint == self._fingerprint
+        ):
+            self.skipped_updates += 1
+            return
+        self._fingerprint = fingerprint
+        if self._close_callbacks:
+            # Only websocket subscribers read the delta; its dicts are the
+            # attributes the entities are about to use
+            self._refresh_serialized(data)
+            self.last_delta = self._alert_delta(
+                (self.data or {}).get("alerts") or [], data["alerts"], self._attributes
+            )
+        try:
+            self.async_set_updated_data(data)
+        finally:
+            self.last_delta = None
+
+    @staticmethod
+    def _alert_delta(
+        previous: List[Alert],
+        current: List[Alert],
+        serialized: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Diff two alert lists; `serialized` holds the dicts of `current`."""
+        prev_map = {a.identifier: a for a in previous if a.identifier}
+        curr_map = {
+            a.identifier: (a, attributes)
+            for a, attributes in zip(current, serialized)
+            if a.identifier
         }
-
-        # Advance since cursor using latest sent
-        latest_sent = self._extract_latest_sent_iso(normalized)
-        if latest_sent and latest_sent != self._last_alert_sent:
-            self._since_iso = latest_sent
-            self._last_alert_sent = latest_sent
-
-        return {"alerts": active_alerts}
-
-    def _normalize_data(
-        self, raw: Dict[str, Any], language: str
-    ) -> List[Dict[str, Any]]:
-        alerts = raw.get("alerts") or []
-        normalized: List[Dict[str, Any]] = []
+        added: List[Dict[str, Any]] = []
+        updated: List[Dict[str, Any]] = []
+        for identifier, (alert, attributes) in curr_map.items():
+            old = prev_map.get(identifier)
+            if old is None:
+                added.append(attributes)
+            elif (old.msg_type, old.sent_iso, old.content_hash) != (
+                alert.msg_type,
+                alert.sent_iso,
+                alert.content_hash,
+            ):
+                updated.append(attributes)
+        removed = [i for i in prev_map if i not in curr_map]
+        return {"added": added, "updated": updated, "removed": removed}
+
+    @callback
+    def async_on_close(self, close_callback: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback run when the entry unloads; return a remover."""
+        self._close_callbacks.append(close_callback)
+
+        @callback
+        def _remove() -> None:
+            if close_callback in self._close_callbacks:
+                self._close_callbacks.remove(close_callback)
+
+        return _remove
+
+    @callback
+    def async_close(self) -> None:
+        """Stop timers and notify websocket subscribers that the entry unloaded."""
+        self.async_cancel_boundary_timer()
+        callbacks, self._close_callbacks = self._close_callbacks, []
+        for close_callback in callbacks:
+            close_callback()
+
+    def alert_attributes(self) -> List[Dict[str, Any]]:
+        """Return the entry's alerts as attribute dicts.
+
+        Built once per data update and shared by both entities.
+        """
+        self._refresh_serialized()
+        return self._attributes
+
+    def alert_summary(self) -> List[Dict[str, Any]]:
+        """Return a compact per-alert summary, suitable for recording."""
+        self._refresh_serialized()
+        return self._summary
+
+    def alert_aggregates(self) -> Dict[str, Any]:
+        """Return the aggregates of the entry's alerts, built once per update."""
+        self._refresh_serialized()
+        return self._aggregates
+
+    def _refresh_serialized(self, data: Optional[Dict[str, Any]] = None) -> None:
+        if data is None:
+            data = self.data or {}
+        if self._attributes_source is data:
+            return
+        alerts: List[Alert] = data.get("alerts") or []
+        self._attributes_source = data
+        self._attributes = [a.as_dict() for a in alerts]
+        self._summary = [a.summary() for a in alerts]
+        self._aggregates = self._alert_aggregates(alerts)
+
+    @staticmethod
+    def _alert_aggregates(alerts: List[Alert]) -> Dict[str, Any]:
+        """Highest severity, counts, next expiry and latest headline in one pass.
+
+        Saves templates from walking the full `alerts` attribute.
+        """
+        highest = -1
+        severity_counts: Dict[str, int] = {}
+        category_counts: Dict[str, int] = {}
+        next_expiry: Optional[Alert] = None
+        latest: Optional[Alert] = None
         for alert in alerts:
-            if not isinstance(alert, dict):
-                continue
-            info_list = alert.get("info") or []
-            info_obj = None
-            for i in info_list:
-                if i and i.get("language") == language:
-                    info_obj = i
-                    break
-            if info_obj is None and info_list:
-                info_obj = info_list[0]
-
-            area_list = info_obj.get("area") if info_obj else []
-            resources = info_obj.get("resource") if info_obj else []
-
-            normalized.append(
-                {
-                    "identifier": alert.get("identifier"),
-                    "sender": alert.get("sender"),
-                    "status": alert.get("status"),
-                    "msgType": alert.get("msgType"),
-                    "scope": alert.get("scope"),
-                    "references": alert.get("references"),
-                    "note": alert.get("note"),
-                    "sent": alert.get("sent"),
-                    "info": {
-                        "language": info_obj.get("language") if info_obj else None,
-                        "category": info_obj.get("category") if info_obj else None,
-                        "event": info_obj.get("event") if info_obj else None,
-                        "responseType": info_obj.get("responseType")
-                        if info_obj
-                        else None,
-                        "urgency": info_obj.get("urgency") if info_obj else None,
-                        "severity": info_obj.get("severity") if info_obj else None,
-                        "certainty": info_obj.get("certainty") if info_obj else None,
-                        "effective": info_obj.get("effective") if info_obj else None,
-                        "onset": info_obj.get("onset") if info_obj else None,
-                        "expires": info_obj.get("expires") if info_obj else None,
-                        "headline": _sanitize_text(info_obj.get("headline"))
-                        if info_obj
-                        else None,
-                        "description": _sanitize_text(info_obj.get("description"))
-                        if info_obj
-                        else None,
-                        "instruction": _sanitize_text(info_obj.get("instruction"))
-                        if info_obj
-                        else None,
-                        "contact": info_obj.get("contact") if info_obj else None,
-                        "web": info_obj.get("web") if info_obj else None,
-                        "area": area_list or [],
-                        "resource": resources or [],
-                    },
-                }
+            severity = alert.severity or "Unknown"
+            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+            if severity in SEVERITY_ORDER:
+                highest = max(highest, SEVERITY_ORDER.index(severity))
+            categories = alert.category
+            if not isinstance(categories, list):
+                categories = [categories] if categories else []
+            for category in categories:
+                category_counts[category] = category_counts.get(category, 0) + 1
+            if alert.expires is not None and (
+                next_expiry is None or alert.expires < next_expiry.expires
+            ):
+                next_expiry = alert
+            if latest is None or (
+                alert.sent is not None
+                and (latest.sent is None or alert.sent >= latest.sent)
+            ):
+                latest = alert
+        return {
+            "highest_severity": SEVERITY_ORDER[highest] if highest >= 0 else None,
+            "severity_counts": severity_counts,
+            "category_counts": category_counts,
+            "next_expiry": next_expiry.expires_iso if next_expiry else None,
+            "latest_headline": latest.headline if latest else None,
+        }
+
+    @property
+    def next_boundary(self) -> Optional[datetime]:
+        return self._boundaries[0] if self._boundaries else None
+
+    @callback
+    def async_cancel_boundary_timer(self) -> None:
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+
+    @callback
+    def _handle_boundary(self, now: datetime) -> None:
+        """An alert became effective or expired: re-filter the cached set."""
+        self._unsub_boundary = None
+        self._async_publish(self._process_hub_data())
+
+    def _schedule_next_boundary(self, alerts: List[Alert], now: datetime) -> None:
+        boundaries = [
+            moment
+            for a in alerts
+            for moment in (a.effective, a.onset, a.expires, a.sent)
+            if moment is not None and moment > now
+        ]
+        heapq.heapify(boundaries)
+        self._boundaries = boundaries
+
+        self.async_cancel_boundary_timer()
+        if boundaries:
+            self._unsub_boundary = async_track_point_in_utc_time(
+                self.hass, self._handle_boundary, boundaries[0]
             )
-        return normalized
-
-    def _apply_filters(
-        self, alerts: List[Dict[str, Any]], filters: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        active_only: bool = filters.get("active_only", True)
-        include_update_cancel: bool = filters.get("include_update_cancel", False)
-        severity_min: str = filters.get("severity_min", SEVERITY_MIN_DEFAULT)
-        min_index = (
-            SEVERITY_ORDER.index(severity_min) if severity_min in SEVERITY_ORDER else 0
-        )
 
-        def is_active(a: Dict[str, Any]) -> bool:
-            info = a.get("info") or {}
-            now = dt_util.utcnow()
-            try:
-                exp = (
-                    self._parse_iso(info.get("expires"))
-                    if info.get("expires")
-                    else None
-                )
-                eff = (
-                    self._parse_iso(info.get("effective"))
-                    if info.get("effective")
-                    else None
-                )
-                onset = (
-                    self._parse_iso(info.get("onset")) if info.get("onset") else None
-                )
-            except Exception:  # noqa: BLE001
-                exp = eff = onset = None
-            start = (
-                eff or onset or self._parse_iso(a.get("sent"))
-                if a.get("sent")
-                else None
+    def _process_hub_data(self) -> Dict[str, Any]:
+        # One clock reading per cycle; alert timestamps are pre-parsed
+        now = dt_util.utcnow()
+        location = self._get_location()
+        if location is None:
+            alerts = self.hub.get_area_alerts(self._get_language(), self._geocodes)
+        else:
+            alerts = self.hub.get_location_alerts(
+                self._get_language(), self._geocodes, *location
             )
-            if exp and now >= exp:
-                return False
-            if start and now < start:
-                return False
-            return True
-
-        result: List[Dict[str, Any]] = []
-        for a in alerts:
-            msg_type = a.get("msgType")
-            if not include_update_cancel and msg_type in {"Update", "Cancel"}:
-                continue
-            info = a.get("info") or {}
-            severity = info.get("severity")
-            if severity in SEVERITY_ORDER:
-                if SEVERITY_ORDER.index(severity) < min_index:
-                    continue
-            if active_only and not is_active(a):
-                continue
-            result.append(a)
-        return result
+        active_alerts = self._filter.apply(alerts, now)
+        self._schedule_next_boundary(alerts, now)
 
-    def _parse_iso(self, value: Optional[str]) -> Optional[datetime]:
-        if not value:
-            return None
-        try:
-            # Ensure timezone-aware UTC
-            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone(timezone.utc)
-        except Exception:  # noqa: BLE001
-            return None
+        # Emit events comparing with last state (always, regardless of sensor filters)
+        self._emit_events(
+            previous=self._identifier_to_msgtype,
+            current=alerts,
+            previous_digests=self._identifier_to_digests,
+        )
+        # Update internal maps for next diff
+        seen = {a.identifier: a.msg_type or "" for a in alerts if a.identifier}
+        digests = {a.identifier: a.digests for a in alerts if a.identifier}
+        if (
+            seen != self._identifier_to_msgtype
+            or digests != self._identifier_to_digests
+        ):
+            self._identifier_to_msgtype = seen
+            self._identifier_to_digests = digests
+            self._persist.async_delay_save(
+                self._data_to_persist, STORAGE_SAVE_DELAY_SECONDS
+            )
 
-    def _extract_latest_sent_iso(self, alerts: List[Dict[str, Any]]) -> Optional[str]:
-        latest: Optional[datetime] = None
-        latest_str: Optional[str] = None
-        for a in alerts:
-            s = a.get("sent")
-            dt = self._parse_iso(s)
-            if dt and (latest is None or dt > latest):
-                latest = dt
-                latest_str = s
-        return latest_str
+        return {"alerts": active_alerts}
 
     def _emit_events(
         self,
         previous: Dict[str, str],
-        current: List[Dict[str, Any]],
+        current: List[Alert],
+        previous_digests: Optional[Dict[str, bytes]] = None,
     ) -> None:
-        curr_map = {a["identifier"]: a for a in current if a.get("identifier")}
+        entry_id = self.config_entry.entry_id
+        queue = self._events.async_queue
+        curr_map = {a.identifier: a for a in current if a.identifier}
         prev_ids = set(previous.keys())
         curr_ids = set(curr_map.keys())
 
         # New
         for new_id in curr_ids - prev_ids:
             alert = curr_map[new_id]
-            if alert.get("msgType") == "Alert":
-                self.hass.bus.async_fire(EVENT_NEW_ALERT, alert)
+            msg_type = alert.msg_type
+            if msg_type == "Alert":
+                queue(EVENT_NEW_ALERT, alert, entry_id)
+                continue
+            # Update/Cancel messages carry their own identifier and supersede
+            # the alert they reference
+            if not any(
+                ref in previous for ref in referenced_identifiers(alert.references)
+            ):
+                continue
+            if msg_type == "Update":
+                queue(EVENT_UPDATED_ALERT, alert, entry_id)
+            elif msg_type == "Cancel":
+                queue(EVENT_CANCELED_ALERT, alert, entry_id)
 
         # Updated / Canceled
         for common_id in curr_ids & prev_ids:
             prev_type = previous.get(common_id)
-            curr_type = curr_map[common_id].get("msgType")
-            if curr_type == "Update" and prev_type != "Update":
-                self.hass.bus.async_fire(EVENT_UPDATED_ALERT, curr_map[common_id])
-            if curr_type == "Cancel" and prev_type != "Cancel":
-                self.hass.bus.async_fire(EVENT_CANCELED_ALERT, curr_map[common_id])
+            alert = curr_map[common_id]
+            if alert.msg_type == "Update" and prev_type != "Update":
+                queue(EVENT_UPDATED_ALERT, alert, entry_id)
+            if alert.msg_type == "Cancel" and prev_type != "Cancel":
+                queue(EVENT_CANCELED_ALERT, alert, entry_id)
+            elif alert.msg_type == prev_type and previous_digests:
+                # Same message type, different content: name what changed
+                old = previous_digests.get(common_id)
+                if old is not None and old != alert.digests:
+                    changed = changed_fields(old, alert.digests)
+                    queue(EVENT_CHANGED_ALERT, alert, entry_id, changed=changed)
@@ -0,0 +1,148 @@
+"""Keyed store of raw CAP alerts maintained from full and `since` responses."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .util import parse_iso
+
+# How long a Cancel (or an alert without `expires`) is kept after being sent
+RETENTION_WITHOUT_EXPIRY = timedelta(hours=24)
+
+
+def referenced_identifiers(references: Optional[str]) -> List[str]:
+    """Return identifiers from a CAP `references` value.
+
+    The value is a space separated list of `sender,identifier,sent` triplets.
+    """
+    if not references or not isinstance(references, str):
+        return []
+    identifiers: List[str] = []
+    for triplet in references.split():
+        parts = triplet.split(",")
+        if len(parts) >= 2 and parts[1]:
+            identifiers.append(parts[1])
+    return identifiers
+
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _alert_times(
+    alert: Dict[str, Any],
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Return parsed (sent, latest expires over all info blocks)."""
+    expires: Optional[datetime] = None
+    for info in alert.get("info") or []:
+        if not isinstance(info, dict):
+            continue
+        exp = parse_iso(info.get("expires"))
+        if exp and (expires is None or exp > expires):
+            expires = exp
+    return parse_iso(alert.get("sent")), expires
+
+
+class AlertStore:
+    """Active CAP alerts keyed by `identifier`.
+
+    Update and Cancel messages supersede the alerts listed in their
+    `references`, so applying a delta response keeps exactly one message per
+    alert thread: the latest one. Timestamps are parsed once on insert.
+    """
+
+    def __init__(self) -> None:
+        self._alerts: Dict[str, Dict[str, Any]] = {}
+        self._times: Dict[str, Tuple[Optional[datetime], Optional[datetime]]] = {}
+        self._superseded: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def alerts(self) -> List[Dict[str, Any]]:
+        """Return the stored alerts, oldest first."""
+        return list(self._alerts.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable snapshot for persistence."""
+        return {"alerts": self.alerts(), "superseded": sorted(self._superseded)}
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        """Load a snapshot produced by `as_dict`."""
+        self._alerts = {
+            a["identifier"]: a
+            for a in snapshot.get("alerts") or []
+            if isinstance(a, dict) and a.get("identifier")
+        }
+        self._times = {i: _alert_times(a) for i, a in self._alerts.items()}
+        self._superseded = set(snapshot.get("superseded") or [])
+
+    def replace(self, alerts: Iterable[Dict[str, Any]]) -> None:
+        """Replace the content with a full (non-delta) response."""
+        self._alerts = {}
+        self._times = {}
+        self._superseded = set()
+        self.apply_delta(alerts)
+
+    def apply_delta(self, alerts: Iterable[Dict[str, Any]]) -> bool:
+        """Merge alerts from a `since` response. Return True if anything changed."""
+        changed = False
+        incoming = [
+            (_alert_times(a), a)
+            for a in alerts
+            if isinstance(a, dict) and a.get("identifier")
+        ]
+        incoming.sort(key=lambda item: item[0][0] or _EPOCH)
+        for times, alert in incoming:
+            identifier = alert["identifier"]
+            if identifier in self._superseded:
+                # Late copy of a message already replaced by an Update/Cancel
+                continue
+            if alert.get("msgType") in ("Update", "Cancel"):
+                for ref in referenced_identifiers(alert.get("references")):
+                    if ref == identifier:
+                        continue
+                    self._superseded.add(ref)
+                    if self._alerts.pop(ref, None) is not None:
+                        del self._times[ref]
+                        changed = True
+            if self._alerts.get(identifier) != alert:
+                # Re-insert so iteration order follows `sent`
+                self._alerts.pop(identifier, None)
+                self._alerts[identifier] = alert
+                self._times[identifier] = times
+                changed = True
+        return changed
+
+    def prune(self, now: datetime) -> bool:
+        """Drop expired alerts. Return True if anything was removed."""
+        expired = [
+            identifier
+            for identifier, (sent, expires) in self._times.items()
+            if self._is_expired(sent, expires, now)
+        ]
+        for identifier in expired:
+            del self._alerts[identifier]
+            del self._times[identifier]
+        if expired and len(self._superseded) > 10 * max(len(self._alerts), 100):
+            # Superseded ids only matter while late copies may still arrive
+            self._superseded = set()
+        return bool(expired)
+
+    def latest_sent(self) -> Optional[str]:
+        """Return the `sent` value of the most recent alert, as sent by the API."""
+        latest: Optional[datetime] = None
+        latest_id: Optional[str] = None
+        for identifier, (sent, _expires) in self._times.items():
+            if sent and (latest is None or sent > latest):
+                latest = sent
+                latest_id = identifier
+        return self._alerts[latest_id].get("sent") if latest_id else None
+
+    @staticmethod
+    def _is_expired(
+        sent: Optional[datetime], expires: Optional[datetime], now: datetime
+    ) -> bool:
+        if expires is not None:
+            return now >= expires
+        return sent is not None and now - sent >= RETENTION_WITHOUT_EXPIRY
@@ -1,5 +1,4 @@
 import logging
-from typing import Any, Dict, List
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -33,6 +32,8 @@ async def async_setup_entry(
 
 
 class KrisinformationActiveBinary(CoordinatorEntity, BinarySensorEntity):
+    _unrecorded_attributes = frozenset({"alerts"})
+
     def __init__(self, entry_id: str, coordinator) -> None:
         super().__init__(coordinator)
         config = coordinator.config
@@ -65,14 +66,14 @@ class KrisinformationActiveBinary(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         data = self.coordinator.data or {}
-        alerts: List[Dict[str, Any]] = data.get("alerts") or []
-        return len(alerts) > 0
+        return len(data.get("alerts") or []) > 0
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data or {}
-        alerts = data.get("alerts") or []
-        return {"alerts": alerts}
+        return {
+            "alerts": self.coordinator.alert_attributes(),
+            "alert_summary": self.coordinator.alert_summary(),
+        }
 
     @property
     def device_info(self):
@@ -3,6 +3,7 @@ from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
 from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
 
 from .const import (
     DOMAIN,
@@ -18,8 +19,27 @@ from .const import (
     CONF_API_ENV,
     API_ENV_PRODUCTION,
     API_ENV_TEST,
+    CONF_UPDATE_INTERVAL,
+    UPDATE_INTERVAL_DEFAULT_SECONDS,
+    CONF_MIN_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL_DEFAULT_SECONDS,
+    CONF_MAX_UPDATE_INTERVAL,
+    MAX_UPDATE_INTERVAL_DEFAULT_SECONDS,
+    CONF_LOCATION_ZONE,
+    LOCATION_OFF,
+    CONF_AREAS,
+    CONF_URGENCY,
+    URGENCY_ORDER,
+    CONF_CERTAINTY,
+    CERTAINTY_ORDER,
+    CONF_CATEGORIES,
+    CATEGORY_OPTIONS,
 )
 
+INTERVAL_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=30, max=3600))
+# Extra areas for one entry; the whole country is chosen as the municipality
+AREA_OPTIONS = [name for name in MUNICIPALITY_OPTIONS if name != MUNICIPALITY_DEFAULT]
+
 
 DATA_SCHEMA = vol.Schema(
     {
@@ -45,10 +65,23 @@ DATA_SCHEMA = vol.Schema(
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None):
+        entry = self.config_entry
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Keep options the form does not show (e.g. active_only)
+            return self.async_create_entry(
+                title="", data={**entry.options, **user_input}
+            )
 
-        options = self.config_entry.options
+        # Entries created by the user step keep their choices in data
+        options = {**entry.data, **entry.options}
+        zones = sorted(self.hass.states.async_entity_ids("zone"))
+        location = options.get(CONF_LOCATION_ZONE, LOCATION_OFF)
+        if location not in zones:
+            location = LOCATION_OFF
+        areas = options.get(CONF_AREAS) or []
+        if isinstance(areas, str):
+            areas = [name.strip() for name in areas.split(",")]
+        areas = [name for name in areas if name in AREA_OPTIONS]
         schema = vol.Schema(
             {
                 vol.Optional(
@@ -64,10 +97,44 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_SEVERITY_MIN,
                     default=options.get(CONF_SEVERITY_MIN, SEVERITY_MIN_DEFAULT),
                 ): vol.In(["Minor", "Moderate", "Severe", "Extreme"]),
+                vol.Optional(
+                    CONF_URGENCY, default=options.get(CONF_URGENCY, URGENCY_ORDER[0])
+                ): vol.In(URGENCY_ORDER),
+                vol.Optional(
+                    CONF_CERTAINTY,
+                    default=options.get(CONF_CERTAINTY, CERTAINTY_ORDER[0]),
+                ): vol.In(CERTAINTY_ORDER),
+                vol.Optional(
+                    CONF_CATEGORIES, default=options.get(CONF_CATEGORIES, [])
+                ): cv.multi_select(CATEGORY_OPTIONS),
                 vol.Optional(
                     CONF_API_ENV,
                     default=options.get(CONF_API_ENV, API_ENV_PRODUCTION),
                 ): vol.In([API_ENV_PRODUCTION, API_ENV_TEST]),
+                vol.Optional(
+                    CONF_MIN_UPDATE_INTERVAL,
+                    default=options.get(
+                        CONF_MIN_UPDATE_INTERVAL, MIN_UPDATE_INTERVAL_DEFAULT_SECONDS
+                    ),
+                ): INTERVAL_VALIDATOR,
+                vol.Optional(
+                    CONF_UPDATE_INTERVAL,
+                    default=options.get(
+                        CONF_UPDATE_INTERVAL, UPDATE_INTERVAL_DEFAULT_SECONDS
+                    ),
+                ): INTERVAL_VALIDATOR,
+                vol.Optional(
+                    CONF_MAX_UPDATE_INTERVAL,
+                    default=options.get(
+                        CONF_MAX_UPDATE_INTERVAL, MAX_UPDATE_INTERVAL_DEFAULT_SECONDS
+                    ),
+                ): INTERVAL_VALIDATOR,
+                vol.Optional(CONF_AREAS, default=areas): cv.multi_select(
+                    AREA_OPTIONS
+                ),
+                vol.Optional(CONF_LOCATION_ZONE, default=location): vol.In(
+                    [LOCATION_OFF, *zones]
+                ),
             }
         )
         return self.async_show_form(step_id="init", data_schema=schema)
@@ -177,6 +244,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_MUNICIPALITY: user_input[CONF_MUNICIPALITY],
             }
             new_options = {
+                # Keep options only editable from the options flow
+                **entry.options,
                 CONF_LANGUAGE: user_input.get(
                     CONF_LANGUAGE, opt_defaults[CONF_LANGUAGE]
                 ),
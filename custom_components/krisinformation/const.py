@@ -18,38 +18,61 @@ CARD_LEGACY_BASE_URL = f"/local/{CARD_FILENAME}"
 FRONTEND_DATA_KEY = f"{DOMAIN}_frontend"
 FRONTEND_DATA_COMPONENT_LISTENER = f"{DOMAIN}_component_listener"
 
+# Shared fetch hubs, one per API environment
+HUB_DATA_KEY = f"{DOMAIN}_hubs"
+REQUEST_GATE_DATA_KEY = f"{DOMAIN}_request_gate"
+EVENT_DISPATCHER_DATA_KEY = f"{DOMAIN}_event_dispatcher"
+
 # Config/Options keys
 CONF_NAME = "name"
 CONF_MUNICIPALITY = "municipality"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
 CONF_LANGUAGE = "language"
 CONF_INCLUDE_RESOURCES = "include_resources"
 CONF_ACTIVE_ONLY = "active_only"
 CONF_INCLUDE_UPDATE_CANCEL = "include_update_cancel"
 CONF_SEVERITY_MIN = "severity_min"
-CONF_URGENCY = "urgency"
-CONF_CERTAINTY = "certainty"
-CONF_AREAS = "areas"  # comma-separated list of municipalities/counties
+CONF_URGENCY = "urgency"  # minimum urgency
+CONF_CERTAINTY = "certainty"  # minimum certainty
+CONF_CATEGORIES = "categories"  # CAP categories to keep, empty for all
+CONF_AREAS = "areas"  # extra municipalities/counties (list or comma-separated)
 CONF_API_ENV = "api_environment"  # 'production' | 'test'
+CONF_LOCATION_ZONE = "location_zone"  # 'off' | zone entity id
 
 # Defaults
 MUNICIPALITY_DEFAULT = "Hela Sverige"
 LANGUAGE_DEFAULT = "sv-SE"
 UPDATE_INTERVAL_DEFAULT_SECONDS = 300
+MIN_UPDATE_INTERVAL_DEFAULT_SECONDS = 60
+MAX_UPDATE_INTERVAL_DEFAULT_SECONDS = 900
 INCLUDE_RESOURCES_DEFAULT = True
 ACTIVE_ONLY_DEFAULT = True
 INCLUDE_UPDATE_CANCEL_DEFAULT = False
 SEVERITY_MIN_DEFAULT = "Minor"  # Minor, Moderate, Severe, Extreme
 API_ENV_PRODUCTION = "production"
 API_ENV_TEST = "test"
+LOCATION_OFF = "off"
+LOCATION_HOME_ZONE = "zone.home"
 
 # API endpoints for fetching alerts
 # Reference: `https://vmaapi.sr.se/index.html`
 PRODUCTION_BASE_URL = "https://vmaapi.sr.se/api/v3/alerts"
 TEST_BASE_URL = "https://vmaapi.sr.se/testapi/v3/alerts"
 
+# Persistent cache (homeassistant.helpers.storage)
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY_SECONDS = 10
+
 # HTTP
 DEFAULT_TIMEOUT_SECONDS = 10
+# Response bodies from this size on are decoded and normalized in the executor
+OFFLOAD_THRESHOLD_BYTES = 128 * 1024
+# Larger bodies, or bodies without Content-Length, are parsed while streaming
+STREAM_THRESHOLD_BYTES = 1024 * 1024
+# Responses larger than this are rejected
+MAX_RESPONSE_BYTES = 32 * 1024 * 1024
 USER_AGENT_PRODUCT = "HomeAssistantKrisinformation"
 
 
@@ -66,10 +89,16 @@ def _load_manifest_version() -> str:
 
 INTEGRATION_VERSION = _load_manifest_version()
 
+# Websocket commands
+WS_TYPE_ALERTS = f"{DOMAIN}/alerts"
+WS_TYPE_SUBSCRIBE = f"{DOMAIN}/subscribe"
+
 # Events
 EVENT_NEW_ALERT = f"{DOMAIN}_new_alert"
 EVENT_UPDATED_ALERT = f"{DOMAIN}_updated_alert"
 EVENT_CANCELED_ALERT = f"{DOMAIN}_canceled_alert"
+# Content of an alert changed within the same msgType
+EVENT_CHANGED_ALERT = f"{DOMAIN}_changed_alert"
 
 # Device info
 DEVICE_MANUFACTURER = "Sveriges Radio / MSB"
@@ -77,6 +106,24 @@ DEVICE_MODEL = "VMA v3 API"
 
 # Severity ordering for filtering/aggregation
 SEVERITY_ORDER = ["Minor", "Moderate", "Severe", "Extreme"]
+# Urgency and certainty ordering for filtering, lowest first
+URGENCY_ORDER = ["Past", "Future", "Expected", "Immediate"]
+CERTAINTY_ORDER = ["Unlikely", "Possible", "Likely", "Observed"]
+# CAP info categories
+CATEGORY_OPTIONS = [
+    "Geo",
+    "Met",
+    "Safety",
+    "Security",
+    "Rescue",
+    "Fire",
+    "Health",
+    "Env",
+    "Transport",
+    "Infra",
+    "CBRNE",
+    "Other",
+]
 
 __all__ = [
     "COUNTY_MAPPING",
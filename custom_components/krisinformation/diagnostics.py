@@ -7,6 +7,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
+from .event_dispatcher import get_event_dispatcher
 
 TO_REDACT = {"contact"}
 
@@ -15,15 +16,36 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    data = coordinator.data or {}
+    hub = coordinator.hub
     return {
         "config": async_redact_data(dict(entry.data), TO_REDACT),
         "options": async_redact_data(dict(entry.options), TO_REDACT),
         "coordinator": {
             "last_success": coordinator.last_update_success,
-            "update_interval": coordinator.update_interval.total_seconds()
-            if coordinator.update_interval
-            else None,
+            "setup_seconds": coordinator.setup_seconds,
+            "skipped_updates": coordinator.skipped_updates,
+            "last_process_ms": coordinator.last_process_ms,
+            "next_boundary": (
+                coordinator.next_boundary.isoformat()
+                if coordinator.next_boundary
+                else None
+            ),
+            "update_interval": (
+                hub.update_interval.total_seconds() if hub.update_interval else None
+            ),
         },
-        "data": async_redact_data(data, TO_REDACT),
+        "hub": {
+            "api_env": hub.api_env,
+            "last_success": hub.last_update_success,
+            "entries": len(hub.entry_ids),
+            "poll_bounds": hub.poll_bounds._asdict(),
+            "activity_hot": hub.activity_hot,
+            "deferred_requests": hub.request_gate.deferred_requests,
+            "last_cycle": hub.cycle_stats,
+            "validator_cache": hub.validator_stats,
+        },
+        "events": get_event_dispatcher(hass).stats(),
+        "data": async_redact_data(
+            {"alerts": coordinator.alert_attributes()}, TO_REDACT
+        ),
     }
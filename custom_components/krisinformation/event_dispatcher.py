@@ -0,0 +1,150 @@
+"""Integration-wide alert events, deduplicated across config entries."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import EVENT_CHANGED_ALERT, EVENT_DISPATCHER_DATA_KEY
+from .models import Alert
+
+# At most this many events are fired per flush ...
+MAX_EVENTS_PER_FLUSH = 20
+# ... and flushes are at least this many seconds apart
+FLUSH_INTERVAL_SECONDS = 1.0
+
+# (identifier, msgType, language of the alert's info block)
+_Key = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class AlertEventDispatcher:
+    """Fire each (identifier, msgType) transition once per language, with its entries.
+
+    Coordinators queue their transitions while handling a hub update; the
+    queue is flushed once they are all done, so an alert matching many
+    entries becomes one event listing their `entry_ids`. Entries using
+    another language get their own event, with the alert in that language.
+
+    Flushes are at least `FLUSH_INTERVAL_SECONDS` apart and fire at most
+    `max_events` events. Transitions queued in between are coalesced per
+    message and language, keeping the newest version of the alert. When
+    more are pending than a flush may fire, the most recently queued go
+    first and the rest follow in later flushes, so a new alert does not
+    wait behind a backlog.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        max_events: int = MAX_EVENTS_PER_FLUSH,
+        interval: float = FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self.hass = hass
+        self._max_events = max_events
+        self._interval = interval
+        # key -> (event type, alert, entry ids, changed fields), oldest first
+        self._pending: Dict[_Key, Tuple[str, Alert, List[str], List[str]]] = {}
+        self._flush_scheduled = False
+        self._last_flush: Optional[float] = None
+        self._unsub_later: Optional[Callable[[], None]] = None
+        self.fired = 0
+        self.merged = 0
+
+    @callback
+    def async_queue(
+        self,
+        event_type: str,
+        alert: Alert,
+        entry_id: str,
+        changed: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Queue `event_type` for `alert` on behalf of `entry_id`.
+
+        `changed` lists the fields a change event reports; merged change
+        events report the union. A change merged with a new, updated or
+        canceled transition of the same message is reported as that
+        transition, since listeners have not seen the message yet.
+        """
+        key = (alert.identifier, alert.msg_type, alert.language)
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            self._pending[key] = (event_type, alert, [entry_id], list(changed or ()))
+        else:
+            self.merged += 1
+            pending_type, _alert, entry_ids, fields = pending
+            if entry_id not in entry_ids:
+                entry_ids.append(entry_id)
+            if pending_type == EVENT_CHANGED_ALERT:
+                if event_type == EVENT_CHANGED_ALERT:
+                    fields.extend(f for f in changed or () if f not in fields)
+                else:
+                    pending_type, fields = event_type, []
+            # Keep the newest version of the alert, queued as the newest
+            self._pending[key] = (pending_type, alert, entry_ids, fields)
+        self._async_schedule_flush()
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        if self._flush_scheduled:
+            return
+        self._flush_scheduled = True
+        wait = (
+            0.0
+            if self._last_flush is None
+            else self._last_flush + self._interval - self.hass.loop.time()
+        )
+        if wait > 0:
+            self._unsub_later = async_call_later(self.hass, wait, self._async_flush)
+        else:
+            # Runs after the current hub update has reached every coordinator
+            self.hass.async_create_task(self._async_flush_soon())
+
+    async def _async_flush_soon(self) -> None:
+        if self._flush_scheduled:
+            self._async_flush()
+
+    @callback
+    def _async_flush(self, _now: Any = None, *, limit: Optional[int] = None) -> None:
+        self._flush_scheduled = False
+        self._unsub_later = None
+        self._last_flush = self.hass.loop.time()
+        limit = self._max_events if limit is None else limit
+        keys = list(self._pending)
+        for key in keys[max(len(keys) - limit, 0) :]:
+            event_type, alert, entry_ids, changed = self._pending.pop(key)
+            data = alert.as_dict()
+            data["entry_ids"] = entry_ids
+            if changed:
+                data["changed"] = changed
+            self.hass.bus.async_fire(event_type, data)
+            self.fired += 1
+        if self._pending:
+            self._async_schedule_flush()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Fire everything still queued and stop the flush timer."""
+        if self._unsub_later is not None:
+            self._unsub_later()
+            self._unsub_later = None
+        if self._pending:
+            self._async_flush(limit=len(self._pending))
+        self._flush_scheduled = False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "fired": self.fired,
+            "merged": self.merged,
+        }
+
+
+def get_event_dispatcher(hass: HomeAssistant) -> AlertEventDispatcher:
+    """Return the integration-wide event dispatcher."""
+    dispatcher = hass.data.get(EVENT_DISPATCHER_DATA_KEY)
+    if dispatcher is None:
+        dispatcher = hass.data[EVENT_DISPATCHER_DATA_KEY] = AlertEventDispatcher(hass)
+    return dispatcher
@@ -0,0 +1,113 @@
+"""Entry-side alert filter, compiled once from the entry options."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional, Sequence
+
+from .const import (
+    CERTAINTY_ORDER,
+    CONF_CATEGORIES,
+    CONF_CERTAINTY,
+    CONF_INCLUDE_UPDATE_CANCEL,
+    CONF_SEVERITY_MIN,
+    CONF_URGENCY,
+    INCLUDE_UPDATE_CANCEL_DEFAULT,
+    SEVERITY_MIN_DEFAULT,
+    SEVERITY_ORDER,
+    URGENCY_ORDER,
+)
+from .models import Alert
+
+UPDATE_CANCEL = frozenset({"Update", "Cancel"})
+
+
+def _below(order: Sequence[str], minimum: Optional[str]) -> FrozenSet[str]:
+    """Return the ranked values below `minimum`; unranked values always pass."""
+    rank = {value: index for index, value in enumerate(order)}
+    return frozenset(order[: rank.get(minimum or "", 0)])
+
+
+class AlertFilter:
+    """Severity, urgency, certainty, category, msgType and activity predicates.
+
+    Minimum levels are turned into sets of excluded values when the filter
+    is built, so checking an alert is a few set lookups. Values outside the
+    rank tables (e.g. "Unknown") are never excluded by a minimum.
+    """
+
+    __slots__ = (
+        "active_only",
+        "excluded_msg_types",
+        "excluded_severities",
+        "excluded_urgencies",
+        "excluded_certainties",
+        "categories",
+    )
+
+    def __init__(
+        self,
+        *,
+        active_only: bool = True,
+        include_update_cancel: bool = False,
+        severity_min: Optional[str] = SEVERITY_MIN_DEFAULT,
+        urgency_min: Optional[str] = None,
+        certainty_min: Optional[str] = None,
+        categories: Iterable[str] = (),
+    ) -> None:
+        self.active_only = active_only
+        self.excluded_msg_types: FrozenSet[str] = (
+            frozenset() if include_update_cancel else UPDATE_CANCEL
+        )
+        self.excluded_severities = _below(SEVERITY_ORDER, severity_min)
+        self.excluded_urgencies = _below(URGENCY_ORDER, urgency_min)
+        self.excluded_certainties = _below(CERTAINTY_ORDER, certainty_min)
+        # Empty means every category
+        self.categories: FrozenSet[str] = frozenset(categories or ())
+
+    @classmethod
+    def from_options(cls, get_option: Callable[[str, Any], Any]) -> "AlertFilter":
+        """Build from an entry, `get_option(key, default)` reading its options."""
+        return cls(
+            active_only=True,  # Always enforce active-only per design
+            include_update_cancel=get_option(
+                CONF_INCLUDE_UPDATE_CANCEL, INCLUDE_UPDATE_CANCEL_DEFAULT
+            ),
+            severity_min=get_option(CONF_SEVERITY_MIN, SEVERITY_MIN_DEFAULT),
+            urgency_min=get_option(CONF_URGENCY, None),
+            certainty_min=get_option(CONF_CERTAINTY, None),
+            categories=get_option(CONF_CATEGORIES, []),
+        )
+
+    def _category_matches(self, category: Any) -> bool:
+        if isinstance(category, list):
+            return any(c in self.categories for c in category)
+        return category in self.categories
+
+    def apply(self, alerts: Iterable[Alert], now: datetime) -> List[Alert]:
+        """Return the alerts passing every predicate, in their given order."""
+        msg_types = self.excluded_msg_types
+        severities = self.excluded_severities
+        urgencies = self.excluded_urgencies
+        certainties = self.excluded_certainties
+        check_category = bool(self.categories)
+        active_only = self.active_only
+        result: List[Alert] = []
+        for a in alerts:
+            if (
+                a.msg_type in msg_types
+                or a.severity in severities
+                or a.urgency in urgencies
+                or a.certainty in certainties
+            ):
+                continue
+            if check_category and not self._category_matches(a.category):
+                continue
+            if active_only:
+                if a.expires is not None and now >= a.expires:
+                    continue
+                start = a.effective or a.onset or a.sent
+                if start is not None and now < start:
+                    continue
+            result.append(a)
+        return result
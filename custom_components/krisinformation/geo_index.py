@@ -0,0 +1,102 @@
+"""County/municipality hierarchy used to split the national alert set by area."""
+
+from __future__ import annotations
+
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+from .models import Alert
+from .municipalities import COUNTY_MAPPING, MUNICIPALITY_MAPPING
+
+# Geocode used by the VMA API for alerts covering the whole country
+NATIONWIDE_GEOCODE = "00"
+# Distinct alert geocode sets remembered by `GeoIndex.expand`
+_EXPAND_CACHE_SIZE = 4096
+
+
+class GeoIndex:
+    """Municipality <-> county lookups over the SCB codes.
+
+    Municipality codes are prefixed by their two-digit county code. An alert
+    concerns its own areas, the counties containing them and, for a
+    county-wide alert, every municipality of the county; `expand` returns
+    that set so matching an entry becomes a set lookup.
+    """
+
+    def __init__(
+        self,
+        counties: Mapping[str, str] = COUNTY_MAPPING,
+        municipalities: Mapping[str, str] = MUNICIPALITY_MAPPING,
+    ) -> None:
+        self._county_codes: FrozenSet[str] = frozenset(counties.values())
+        members: Dict[str, Set[str]] = {code: set() for code in self._county_codes}
+        for code in municipalities.values():
+            members.setdefault(code[:2], set()).add(code)
+        self._members: Dict[str, FrozenSet[str]] = {
+            county: frozenset(codes) for county, codes in members.items()
+        }
+        self._expanded: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+    def county_of(self, code: str) -> Optional[str]:
+        """Return the county code of a county or municipality code."""
+        if len(code) < 2 or code == NATIONWIDE_GEOCODE:
+            return None
+        return code[:2]
+
+    def municipalities_in(self, county: str) -> FrozenSet[str]:
+        return self._members.get(county, frozenset())
+
+    def expand(self, codes: FrozenSet[str]) -> FrozenSet[str]:
+        """Return every area code an alert with these geocodes concerns."""
+        expanded = self._expanded.get(codes)
+        if expanded is not None:
+            return expanded
+        result: Set[str] = set()
+        for code in codes:
+            result.add(code)
+            if code == NATIONWIDE_GEOCODE:
+                continue
+            if len(code) == 2:
+                result.update(self.municipalities_in(code))
+            else:
+                result.add(code[:2])
+        expanded = frozenset(result)
+        if len(self._expanded) >= _EXPAND_CACHE_SIZE:
+            self._expanded.clear()
+        self._expanded[codes] = expanded
+        return expanded
+
+    def partition(
+        self, alerts: Iterable[Alert], geocodes: Iterable[str]
+    ) -> Dict[str, List[Alert]]:
+        """Split `alerts` into one list per requested entry geocode.
+
+        An empty geocode selects the whole country. Alerts without area
+        codes, or with the nationwide code, go to every entry.
+        """
+        buckets: Dict[str, List[Alert]] = {code: [] for code in geocodes}
+        everyone = list(buckets.values())
+        whole_country = buckets.pop("", None)
+        for alert in alerts:
+            expanded = self.expand(alert.geocodes) if alert.geocodes else None
+            if expanded is None or NATIONWIDE_GEOCODE in expanded:
+                for bucket in everyone:
+                    bucket.append(alert)
+                continue
+            if whole_country is not None:
+                whole_country.append(alert)
+            # Walk whichever side is smaller
+            if len(expanded) <= len(buckets):
+                for code in expanded:
+                    bucket = buckets.get(code)
+                    if bucket is not None:
+                        bucket.append(alert)
+            else:
+                for code, bucket in buckets.items():
+                    if code in expanded:
+                        bucket.append(alert)
+        if whole_country is not None:
+            buckets[""] = whole_country
+        return buckets
+
+
+GEO_INDEX = GeoIndex()
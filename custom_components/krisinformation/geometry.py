@@ -0,0 +1,171 @@
+"""CAP area geometry (`polygon`/`circle`) and point containment tests."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+# Mean Earth radius used for circle distances
+EARTH_RADIUS_KM = 6371.0
+
+_Point = Tuple[float, float]
+
+
+class BoundingBox(NamedTuple):
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+    def contains(self, lat: float, lon: float) -> bool:
+        return (
+            self.min_lat <= lat <= self.max_lat
+            and self.min_lon <= lon <= self.max_lon
+        )
+
+    @classmethod
+    def around(cls, boxes: Iterable["BoundingBox"]) -> "BoundingBox":
+        boxes = list(boxes)
+        return cls(
+            min(b.min_lat for b in boxes),
+            min(b.min_lon for b in boxes),
+            max(b.max_lat for b in boxes),
+            max(b.max_lon for b in boxes),
+        )
+
+
+class Polygon:
+    """A closed ring of (lat, lon) points with its bounding box."""
+
+    __slots__ = ("points", "bbox")
+
+    def __init__(self, points: List[_Point]) -> None:
+        if points[0] == points[-1]:
+            points = points[:-1]
+        self.points: Tuple[_Point, ...] = tuple(points)
+        self.bbox = BoundingBox(
+            min(p[0] for p in points),
+            min(p[1] for p in points),
+            max(p[0] for p in points),
+            max(p[1] for p in points),
+        )
+
+    def contains(self, lat: float, lon: float) -> bool:
+        if not self.bbox.contains(lat, lon):
+            return False
+        # Even-odd ray casting along the latitude axis
+        inside = False
+        points = self.points
+        lat_j, lon_j = points[-1]
+        for lat_i, lon_i in points:
+            if (lat_i > lat) != (lat_j > lat):
+                cross = lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+                if lon < cross:
+                    inside = not inside
+            lat_j, lon_j = lat_i, lon_i
+        return inside
+
+
+class Circle:
+    """A centre point and a radius in kilometres."""
+
+    __slots__ = ("lat", "lon", "radius_km", "bbox")
+
+    def __init__(self, lat: float, lon: float, radius_km: float) -> None:
+        self.lat = lat
+        self.lon = lon
+        self.radius_km = radius_km
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cos_lat = math.cos(math.radians(lat))
+        dlon = 180.0 if cos_lat < 1e-6 else min(180.0, dlat / cos_lat)
+        self.bbox = BoundingBox(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+
+    def contains(self, lat: float, lon: float) -> bool:
+        if not self.bbox.contains(lat, lon):
+            return False
+        return haversine_km(self.lat, self.lon, lat, lon) <= self.radius_km
+
+
+_Shape = Union[Polygon, Circle]
+
+
+class AreaGeometry:
+    """All polygons and circles of an alert, behind one bounding box."""
+
+    __slots__ = ("shapes", "bbox")
+
+    def __init__(self, shapes: List[_Shape]) -> None:
+        self.shapes: Tuple[_Shape, ...] = tuple(shapes)
+        self.bbox = BoundingBox.around(s.bbox for s in shapes)
+
+    def contains(self, lat: float, lon: float) -> bool:
+        if not self.bbox.contains(lat, lon):
+            return False
+        return any(shape.contains(lat, lon) for shape in self.shapes)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _parse_point(text: str) -> _Point:
+    lat, lon = text.split(",")
+    return float(lat), float(lon)
+
+
+def parse_polygon(text: Any) -> Optional[Polygon]:
+    """Parse a CAP polygon ("lat,lon lat,lon ..."); None if malformed."""
+    if not isinstance(text, str):
+        return None
+    try:
+        points = [_parse_point(pair) for pair in text.split()]
+    except ValueError:
+        return None
+    if len(points) < 3:
+        return None
+    return Polygon(points)
+
+
+def parse_circle(text: Any) -> Optional[Circle]:
+    """Parse a CAP circle ("lat,lon radius_km"); None if malformed."""
+    if not isinstance(text, str):
+        return None
+    try:
+        center, radius = text.split()
+        lat, lon = _parse_point(center)
+        radius_km = float(radius)
+    except ValueError:
+        return None
+    if radius_km < 0:
+        return None
+    return Circle(lat, lon, radius_km)
+
+
+def _values(value: Any) -> List[Any]:
+    # CAP allows several polygons/circles per area; accept one or a list
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def area_geometry(area_list: List[Dict[str, Any]]) -> Optional[AreaGeometry]:
+    """Return the parsed geometry of CAP `area` entries, None if they have none."""
+    shapes: List[_Shape] = []
+    for area in area_list or []:
+        if not isinstance(area, dict):
+            continue
+        for text in _values(area.get("polygon")):
+            polygon = parse_polygon(text)
+            if polygon is not None:
+                shapes.append(polygon)
+        for text in _values(area.get("circle")):
+            circle = parse_circle(text)
+            if circle is not None:
+                shapes.append(circle)
+    return AreaGeometry(shapes) if shapes else None
@@ -0,0 +1,98 @@
+"""HTTP validators (ETag/Last-Modified) remembered per request URL and query."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Distinct queries remembered; `since` values change as alerts arrive, so
+# only the most recent ones are worth keeping
+MAX_VALIDATOR_ENTRIES = 16
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class ValidatorCache:
+    """LRU cache of response validators keyed by (url, normalized params).
+
+    Validators are only sent back for exactly the query they were received
+    for, so a 304 always refers to the same resource representation.
+    """
+
+    def __init__(self, max_entries: int = MAX_VALIDATOR_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[_Key, Tuple[Optional[str], Optional[str]]]" = (
+            OrderedDict()
+        )
+        self.lookups = 0
+        self.hits = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def _key(url: str, params: Optional[Mapping[str, Any]]) -> _Key:
+        return url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+
+    def conditional_headers(
+        self, url: str, params: Optional[Mapping[str, Any]]
+    ) -> Dict[str, str]:
+        """Return If-None-Match/If-Modified-Since for this query, if known."""
+        self.lookups += 1
+        key = self._key(url, params)
+        validators = self._entries.get(key)
+        if validators is None:
+            return {}
+        self._entries.move_to_end(key)
+        self.hits += 1
+        etag, last_modified = validators
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def update(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        """Remember the validators of a 200 response."""
+        key = self._key(url, params)
+        if not etag and not last_modified:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (etag, last_modified)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def record_not_modified(self) -> None:
+        self.not_modified += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "hit_rate": (
+                round(self.not_modified / self.lookups, 3) if self.lookups else None
+            ),
+        }
+
+    def as_list(self) -> List[List[Any]]:
+        """Return a JSON-serializable snapshot, least recently used first."""
+        return [
+            [url, [list(p) for p in params], etag, last_modified]
+            for (url, params), (etag, last_modified) in self._entries.items()
+        ]
+
+    def restore(self, snapshot: Optional[List[List[Any]]]) -> None:
+        for item in snapshot or []:
+            try:
+                url, params, etag, last_modified = item
+                self.update(url, dict(params), etag, last_modified)
+            except (TypeError, ValueError):
+                continue
@@ -0,0 +1,707 @@
+"""Shared VMA API fetch hub serving all config entries of an API environment."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import async_timeout
+from aiohttp import ClientError, ClientResponseError
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .alert_store import AlertStore
+from .const import (
+    API_ENV_TEST,
+    DEFAULT_TIMEOUT_SECONDS,
+    DOMAIN,
+    HUB_DATA_KEY,
+    INTEGRATION_VERSION,
+    LANGUAGE_DEFAULT,
+    MAX_RESPONSE_BYTES,
+    OFFLOAD_THRESHOLD_BYTES,
+    PRODUCTION_BASE_URL,
+    STORAGE_SAVE_DELAY_SECONDS,
+    STORAGE_VERSION,
+    STREAM_THRESHOLD_BYTES,
+    TEST_BASE_URL,
+    UPDATE_INTERVAL_DEFAULT_SECONDS,
+    USER_AGENT_PRODUCT,
+)
+from .geo_index import GEO_INDEX
+from .http_cache import ValidatorCache
+from .json_stream import AlertArrayParser, AlertStreamError, ResponseTooLargeError
+from .models import Alert
+from .request_gate import RequestGate, get_request_gate, parse_retry_after
+from .scheduler import AdaptivePollScheduler, PollBounds
+from .util import parse_iso
+
+_LOGGER = logging.getLogger(__name__)
+
+# Periodically drop the `since` cursor and rebuild the store from a full fetch
+FULL_RESYNC_INTERVAL = timedelta(hours=6)
+# Read size when streaming a response body
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _decode_alerts(body: bytes) -> List[Dict[str, Any]]:
+    """Decode a VMA response body into its list of raw alerts."""
+    data = json_loads(body) if body else {}
+    alerts = data.get("alerts") if isinstance(data, dict) else None
+    return [a for a in alerts or [] if isinstance(a, dict)]
+
+
+# identifier -> (raw CAP dict, Alert normalized from it)
+_AlertObjects = Dict[str, Tuple[Dict[str, Any], Alert]]
+
+
+def _normalize_incremental(
+    alerts: List[Dict[str, Any]], language: str, previous: _AlertObjects
+) -> Tuple[List[Alert], _AlertObjects]:
+    """Normalize `alerts`, reusing objects built from the same raw dicts.
+
+    The store keeps a raw dict until its alert is replaced, so after a
+    delta only new or changed alerts are normalized again.
+    """
+    objects: _AlertObjects = {}
+    result: List[Alert] = []
+    for raw in alerts:
+        identifier = raw.get("identifier")
+        known = previous.get(identifier)
+        if known is None or known[0] is not raw:
+            known = (raw, Alert.from_cap(raw, language))
+        objects[identifier] = known
+        result.append(known[1])
+    return result, objects
+
+
+def _normalize_languages(
+    alerts: List[Dict[str, Any]],
+    languages: Set[str],
+    previous: Dict[str, _AlertObjects],
+    with_geometry: bool = False,
+) -> Dict[str, Tuple[List[Alert], _AlertObjects]]:
+    """Normalize `alerts` once per language; safe to run in the executor.
+
+    With `with_geometry` the CAP polygons/circles are parsed here as well,
+    so location matching on the loop finds them ready.
+    """
+    normalized = {
+        language: _normalize_incremental(alerts, language, previous.get(language, {}))
+        for language in languages
+    }
+    if with_geometry:
+        for result, _objects in normalized.values():
+            for alert in result:
+                alert.geometry  # noqa: B018 - parses and caches
+    return normalized
+
+
+def async_get_hub(hass: HomeAssistant, api_env: str) -> "KrisinformationFetchHub":
+    """Return the shared fetch hub for an API environment, creating it if needed."""
+    hubs: Dict[str, KrisinformationFetchHub] = hass.data.setdefault(HUB_DATA_KEY, {})
+    hub = hubs.get(api_env)
+    if hub is None:
+        hub = KrisinformationFetchHub(hass, async_get_clientsession(hass), api_env)
+        hubs[api_env] = hub
+    return hub
+
+
+async def async_release_hub(
+    hass: HomeAssistant, hub: "KrisinformationFetchHub"
+) -> None:
+    """Shut down a hub once no config entry uses it anymore."""
+    if hub.entry_ids:
+        return
+    hubs: Dict[str, KrisinformationFetchHub] = hass.data.get(HUB_DATA_KEY, {})
+    if hubs.get(hub.api_env) is hub:
+        hubs.pop(hub.api_env)
+    await hub.async_persist()
+    await hub.async_shutdown()
+
+
+class KrisinformationFetchHub(DataUpdateCoordinator):
+    """Poll the VMA API once per interval for every entry of one environment.
+
+    The hub always fetches the national alert set; entries filter it locally
+    by geocode. After an initial full fetch it polls with `since` and merges
+    the deltas into an `AlertStore`, so the data always holds the complete
+    active set. Normalized alerts are cached per language for the current
+    set so entries sharing a language share the work.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session,
+        api_env: str,
+        *,
+        max_body_bytes: int = MAX_RESPONSE_BYTES,
+    ) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"Krisinformation Fetch Hub ({api_env})",
+            update_interval=timedelta(seconds=UPDATE_INTERVAL_DEFAULT_SECONDS),
+            config_entry=None,
+        )
+        self.session = session
+        self.api_env = api_env
+        self.entry_ids: Set[str] = set()
+
+        # Caching / conditional requests
+        self._validators = ValidatorCache()
+        self._since_iso: Optional[str] = None
+        self._last_full_sync: Optional[datetime] = None
+
+        self._store = AlertStore()
+        # Validators, cursor and alert set survive restarts so the first
+        # request after startup can be conditional
+        self._persist: Store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.hub_{api_env}")
+        self._restored = False
+        self._startup_refresh_done = False
+        # Cursor, last full sync and validators as last handed to the store
+        self._persisted_state: Optional[Tuple[Any, ...]] = None
+
+        self._normalized_cache: Dict[str, List[Alert]] = {}
+        self._alert_objects: Dict[str, _AlertObjects] = {}
+        # language -> entry geocode -> alerts concerning that area
+        self._partitions: Dict[str, Dict[str, List[Alert]]] = {}
+        self._entry_geocodes: Dict[str, FrozenSet[str]] = {}
+        self._entry_languages: Dict[str, str] = {}
+        # (language, entry geocodes) -> merged alerts of multi-area entries
+        self._area_unions: Dict[Tuple[str, FrozenSet[str]], List[Alert]] = {}
+        # (language, geocodes, latitude, longitude) -> alerts covering the point
+        self._location_matches: Dict[
+            Tuple[str, FrozenSet[str], float, float], List[Alert]
+        ] = {}
+        self._first_refresh_lock = asyncio.Lock()
+        # Separate from the refresh lock: entries set up while the first
+        # request is running only wait for the local store
+        self._restore_lock = asyncio.Lock()
+
+        self._user_agent = self._compose_user_agent()
+
+        # Adaptive polling from alert activity, Cache-Control and 429 backoff
+        self._scheduler = AdaptivePollScheduler()
+        self._max_age: Optional[int] = None
+        # Interval chosen by the scheduler; update_interval adds jitter to it
+        self._interval = self.update_interval
+        self._gate = get_request_gate(hass)
+
+        # Bodies from this size on are decoded and normalized in the executor
+        self.offload_threshold_bytes = OFFLOAD_THRESHOLD_BYTES
+        # Bodies from this size on, or of unknown size, are parsed as they
+        # arrive; larger than max_body_bytes aborts the request
+        self.stream_threshold_bytes = STREAM_THRESHOLD_BYTES
+        self.max_body_bytes = max_body_bytes
+        self.cycle_stats: Dict[str, Any] = {}
+
+    async def async_restore(self) -> None:
+        """Load the persisted cache once, before the first request."""
+        async with self._restore_lock:
+            if self._restored:
+                return
+            self._restored = True
+            try:
+                stored = await self._persist.async_load()
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.warning("Kunde inte läsa sparad VMA-cache: %s", err)
+                return
+            if not stored:
+                return
+            self._validators.restore(stored.get("validators"))
+            self._since_iso = stored.get("since")
+            self._last_full_sync = parse_iso(stored.get("last_full_sync"))
+            self._store.restore(stored.get("store") or {})
+            self._persisted_state = self._persist_state()
+            if self._last_full_sync is not None:
+                # Serve the snapshot until the first request completes
+                self.data = {"alerts": self._store.alerts()}
+            _LOGGER.debug(
+                "Restored %s cached alerts for %s", len(self._store), self.api_env
+            )
+
+    def _persist_state(self) -> Tuple[Any, ...]:
+        return (self._since_iso, self._last_full_sync, self._validators.as_list())
+
+    @callback
+    def _data_to_persist(self) -> Dict[str, Any]:
+        return {
+            "validators": self._validators.as_list(),
+            "since": self._since_iso,
+            "last_full_sync": (
+                self._last_full_sync.isoformat() if self._last_full_sync else None
+            ),
+            "store": self._store.as_dict(),
+        }
+
+    async def async_persist(self) -> None:
+        """Write the cache now, replacing a pending delayed write."""
+        await self._persist.async_save(self._data_to_persist())
+        self._persisted_state = self._persist_state()
+
+    async def async_startup_refresh(self) -> None:
+        """Run the first request after startup; later callers wait for it."""
+        async with self._first_refresh_lock:
+            if self._startup_refresh_done:
+                return
+            self._startup_refresh_done = True
+            # Hold the lock so async_ensure_data waits for this request
+            # instead of issuing a second full fetch alongside it
+            await self.async_refresh()
+
+    async def async_ensure_data(self) -> None:
+        """Make sure the hub holds data, fetching once for concurrent callers."""
+        async with self._first_refresh_lock:
+            if self.data is None:
+                self._startup_refresh_done = True
+                await self.async_refresh()
+        if self.data is None:
+            raise UpdateFailed(
+                f"Ingen data från VMA API: {self.last_exception}"
+            ) from self.last_exception
+
+    def get_alerts(self, language: str) -> List[Alert]:
+        """Return the normalized alert set for `language`."""
+        cached = self._normalized_cache.get(language)
+        if cached is None:
+            # Read the store, not self.data: the scheduler asks for the
+            # alerts before the coordinator has published the merged set
+            cached, self._alert_objects[language] = _normalize_incremental(
+                self._store.alerts(), language, self._alert_objects.get(language, {})
+            )
+            self._normalized_cache[language] = cached
+        return cached
+
+    def get_area_alerts(self, language: str, geocodes: FrozenSet[str]) -> List[Alert]:
+        """Return the alerts concerning any of `geocodes` ("" for the whole country).
+
+        The set is partitioned once per cycle and language for the areas of
+        all attached entries, instead of each entry scanning every alert.
+        Entries with several areas get one deduplicated list in the order of
+        the national set.
+        """
+        partition = self._partitions.get(language)
+        if partition is None or not geocodes.issubset(partition):
+            codes: Set[str] = set(geocodes).union(*self._entry_geocodes.values())
+            partition = GEO_INDEX.partition(self.get_alerts(language), codes)
+            self._partitions[language] = partition
+        if len(geocodes) == 1:
+            return partition[next(iter(geocodes))]
+        key = (language, geocodes)
+        merged = self._area_unions.get(key)
+        if merged is None:
+            members = {id(a) for code in geocodes for a in partition[code]}
+            merged = [a for a in self.get_alerts(language) if id(a) in members]
+            self._area_unions[key] = merged
+        return merged
+
+    def get_location_alerts(
+        self,
+        language: str,
+        geocodes: FrozenSet[str],
+        latitude: float,
+        longitude: float,
+    ) -> List[Alert]:
+        """Return the alerts whose CAP geometry covers the given point.
+
+        Alerts without polygons or circles fall back to the area match of
+        `geocodes`. The result is cached until the alert set changes.
+        """
+        key = (language, geocodes, latitude, longitude)
+        cached = self._location_matches.get(key)
+        if cached is not None:
+            return cached
+        in_area = {id(a) for a in self.get_area_alerts(language, geocodes)}
+        matches: List[Alert] = []
+        for alert in self.get_alerts(language):
+            geometry = alert.geometry
+            if geometry is None:
+                if id(alert) in in_area:
+                    matches.append(alert)
+            elif geometry.contains(latitude, longitude):
+                matches.append(alert)
+        self._location_matches[key] = matches
+        return matches
+
+    def _compose_url_and_params(self) -> Tuple[str, Dict[str, str]]:
+        url = TEST_BASE_URL if self.api_env == API_ENV_TEST else PRODUCTION_BASE_URL
+        params: Dict[str, str] = {}
+        if self._since_iso and not self._full_sync_due():
+            params["since"] = self._since_iso
+        return url, params
+
+    def _full_sync_due(self) -> bool:
+        return (
+            self._last_full_sync is None
+            or dt_util.utcnow() - self._last_full_sync >= FULL_RESYNC_INTERVAL
+        )
+
+    def _compose_user_agent(self) -> str:
+        integration_version = INTEGRATION_VERSION or "0.0.0"
+        ha_version = HA_VERSION or "unknown"
+        ua = f"{USER_AGENT_PRODUCT}/{integration_version}"
+        if ha_version:
+            ua = f"{ua} HomeAssistant/{ha_version}"
+        return ua
+
+    def _build_headers(
+        self, url: Optional[str] = None, params: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Return request headers, conditional on validators for this query."""
+        headers = {"User-Agent": self._user_agent, "Accept": "application/json"}
+        if url is not None:
+            headers.update(self._validators.conditional_headers(url, params))
+        return headers
+
+    @property
+    def validator_stats(self) -> Dict[str, Any]:
+        return self._validators.stats()
+
+    async def _async_update_data(self):
+        url, params = self._compose_url_and_params()
+        is_delta = "since" in params
+        headers = self._build_headers(url, params)
+        host = urlsplit(url).netloc
+        wait_seconds = self._gate.reserve(host, self.api_env)
+        if wait_seconds is not None:
+            # Shared budget spent or host under Retry-After: keep current data
+            _LOGGER.debug(
+                "Request to VMA API (%s) deferred %.0f seconds",
+                self.api_env,
+                wait_seconds,
+            )
+            self.update_interval = timedelta(seconds=self._gate.jitter(wait_seconds))
+            if self.data is None:
+                # Nothing fetched yet: an empty set would read as "no alerts"
+                raise UpdateFailed(
+                    f"Anrop till VMA API uppskjutet {wait_seconds:.0f} sekunder"
+                )
+            return self.data
+        try:
+            async with async_timeout.timeout(DEFAULT_TIMEOUT_SECONDS):
+                async with self.session.get(
+                    url, params=params, headers=headers
+                ) as response:
+                    if response.status == 304:
+                        # Not modified: return previous data
+                        _LOGGER.debug("304 Not Modified from VMA API")
+                        self._validators.record_not_modified()
+                        if not is_delta:
+                            # The full set is unchanged since the last full fetch
+                            self._last_full_sync = dt_util.utcnow()
+                        data = self._merge_response(None, is_delta=True)
+                        self._adapt_interval(self._max_age)
+                        return data
+
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        # Holds for every hub polling this host
+                        self._gate.defer(host, retry_after)
+
+                    if response.status == 429:
+                        _LOGGER.warning(
+                            "429 Too Many Requests from VMA API, Retry-After=%s",
+                            response.headers.get("Retry-After"),
+                        )
+                        # Use Retry-After if provided, otherwise exponential backoff
+                        self._interval = self._scheduler.backoff(
+                            self._interval, retry_after
+                        )
+                        self._gate.defer(host, self._interval.total_seconds())
+                        self.update_interval = self._interval
+                        if self.data is None:
+                            raise UpdateFailed("VMA API svarade 429 Too Many Requests")
+                        return self.data
+
+                    response.raise_for_status()
+
+                    # Capture caching headers for this exact query
+                    self._validators.update(
+                        url,
+                        params,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                    )
+                    cache_control = response.headers.get("Cache-Control", "")
+                    self._max_age = None
+                    if "max-age=" in cache_control:
+                        try:
+                            self._max_age = int(
+                                cache_control.split("max-age=")[1].split(",")[0]
+                            )
+                        except ValueError:
+                            pass
+
+                    parse_seconds = stream_executor_seconds = 0.0
+                    streamed = self._should_stream(response.content_length)
+                    if streamed:
+                        (
+                            raw_alerts,
+                            size,
+                            parse_seconds,
+                            stream_executor_seconds,
+                        ) = await self._async_stream_alerts(response)
+                    else:
+                        body = await response.read()
+                        size = len(body)
+
+            executor_seconds = 0.0
+            started = time.perf_counter()
+            offload = size >= self.offload_threshold_bytes
+            if not streamed:
+                if offload:
+                    raw_alerts = await self.hass.async_add_executor_job(
+                        _decode_alerts, body
+                    )
+                    executor_seconds = time.perf_counter() - started
+                else:
+                    raw_alerts = _decode_alerts(body)
+                del body
+        except UpdateFailed:
+            raise
+        except AlertStreamError as err:
+            _LOGGER.warning("Ogiltigt svar från VMA API: %s", err)
+            raise UpdateFailed(f"Ogiltigt svar: {err}") from err
+        except asyncio.TimeoutError as err:
+            _LOGGER.warning(
+                "Timeout vid anrop till VMA API (tidsgräns %ss)",
+                DEFAULT_TIMEOUT_SECONDS,
+            )
+            raise UpdateFailed("API-anrop tog för lång tid") from err
+        except ClientResponseError as err:
+            _LOGGER.warning(
+                "HTTP-fel %s vid anrop till VMA API: %s", err.status, err.message
+            )
+            raise UpdateFailed(f"HTTP-fel {err.status}: {err.message}") from err
+        except ClientError as err:
+            _LOGGER.warning("Nätverksfel vid anrop till VMA API: %s", err)
+            raise UpdateFailed(f"Nätverksfel: {err}") from err
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.exception("Oväntat fel vid anrop till VMA API")
+            raise UpdateFailed(f"Oväntat fel: {err}") from err
+
+        languages = self._languages()
+        # Entries matched by location last cycle will need the geometry again
+        with_geometry = bool(self._location_matches)
+        merged = self._merge_response(raw_alerts, is_delta=is_delta)
+        if offload and not self._normalized_cache:
+            # Normalize the new set off the loop for the languages in use
+            offloaded = time.perf_counter()
+            normalized = await self.hass.async_add_executor_job(
+                _normalize_languages,
+                self._store.alerts(),
+                languages,
+                dict(self._alert_objects),
+                with_geometry,
+            )
+            for language, (alerts, objects) in normalized.items():
+                self._normalized_cache[language] = alerts
+                self._alert_objects[language] = objects
+            executor_seconds += time.perf_counter() - offloaded
+        self._adapt_interval(self._max_age)
+        loop_seconds = time.perf_counter() - started - executor_seconds + parse_seconds
+        executor_seconds += stream_executor_seconds
+        self._record_cycle(size, streamed, offload, loop_seconds, executor_seconds)
+        return merged
+
+    def _should_stream(self, content_length: Optional[int]) -> bool:
+        """Stream bodies of unknown or large size instead of buffering them."""
+        if content_length is None:
+            return True
+        if content_length > self.max_body_bytes:
+            raise ResponseTooLargeError(
+                f"Svaret är {content_length} byte, gränsen är {self.max_body_bytes}"
+            )
+        return content_length >= self.stream_threshold_bytes
+
+    async def _async_stream_alerts(
+        self, response
+    ) -> Tuple[List[Dict[str, Any]], int, float, float]:
+        """Parse the alerts array chunk by chunk.
+
+        Returns the alerts, the body size and the time spent parsing on the
+        event loop and in the executor. Chunks are parsed on the loop until
+        the body reaches `offload_threshold_bytes`, then in the executor.
+        Aborts once the body grows past `max_body_bytes`.
+        """
+        parser = AlertArrayParser()
+        alerts: List[Dict[str, Any]] = []
+        size = 0
+        loop_seconds = executor_seconds = 0.0
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_BYTES):
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise ResponseTooLargeError(
+                    f"Svaret överskrider gränsen på {self.max_body_bytes} byte"
+                )
+            started = time.perf_counter()
+            if size >= self.offload_threshold_bytes:
+                alerts.extend(
+                    await self.hass.async_add_executor_job(parser.feed, chunk)
+                )
+                executor_seconds += time.perf_counter() - started
+            else:
+                alerts.extend(parser.feed(chunk))
+                loop_seconds += time.perf_counter() - started
+        started = time.perf_counter()
+        if size >= self.offload_threshold_bytes:
+            alerts.extend(await self.hass.async_add_executor_job(parser.close))
+            executor_seconds += time.perf_counter() - started
+        else:
+            alerts.extend(parser.close())
+            loop_seconds += time.perf_counter() - started
+        return alerts, size, loop_seconds, executor_seconds
+
+    def _record_cycle(
+        self,
+        size: int,
+        streamed: bool,
+        offloaded: bool,
+        loop_seconds: float,
+        executor_seconds: float,
+    ) -> None:
+        """Keep the cost of the last cycle for diagnostics and debug logs."""
+        self.cycle_stats = {
+            "bytes": size,
+            "streamed": streamed,
+            "offloaded": offloaded,
+            "loop_ms": round(loop_seconds * 1000, 2),
+            "executor_ms": round(executor_seconds * 1000, 2),
+        }
+        _LOGGER.debug(
+            "VMA cycle for %s: %s bytes, streamed=%s, offloaded=%s, "
+            "%.1f ms on the event loop",
+            self.api_env,
+            size,
+            streamed,
+            offloaded,
+            loop_seconds * 1000,
+        )
+
+    def _languages(self) -> Set[str]:
+        """Languages of the attached entries, normalized every cycle."""
+        return set(self._entry_languages.values()) or {LANGUAGE_DEFAULT}
+
+    def _adapt_interval(self, max_age: Optional[int]) -> None:
+        """Pick the next poll interval from the activity in the entries' areas."""
+        geocodes = frozenset().union(*self._entry_geocodes.values())
+        alerts = self.get_area_alerts(min(self._languages()), geocodes)
+        hot = self._scheduler.is_hot(alerts, dt_util.utcnow())
+        interval = self._scheduler.next_interval(self._interval, hot, max_age)
+        if interval != self._interval:
+            _LOGGER.debug(
+                "Poll interval for %s now %s seconds (active=%s)",
+                self.api_env,
+                interval.total_seconds(),
+                hot,
+            )
+        self._interval = interval
+        self.update_interval = timedelta(
+            seconds=self._gate.jitter(interval.total_seconds())
+        )
+
+    def attach_entry(
+        self,
+        entry_id: str,
+        bounds: PollBounds,
+        geocodes: FrozenSet[str] = frozenset({""}),
+        language: str = LANGUAGE_DEFAULT,
+    ) -> None:
+        """Register an entry using the hub, its polling bounds, areas and language.
+
+        Called again when the entry's options change; new bounds apply to
+        the next poll right away.
+        """
+        previous = self._scheduler.bounds
+        self.entry_ids.add(entry_id)
+        self._scheduler.set_bounds(entry_id, bounds)
+        self._entry_geocodes[entry_id] = geocodes
+        self._entry_languages[entry_id] = language
+        if self.data is None:
+            self._interval = timedelta(seconds=self._scheduler.bounds.normal_seconds)
+            self.update_interval = self._interval
+        elif self._scheduler.bounds != previous:
+            self._async_apply_bounds()
+
+    def detach_entry(self, entry_id: str) -> None:
+        previous = self._scheduler.bounds
+        self.entry_ids.discard(entry_id)
+        self._scheduler.remove(entry_id)
+        self._entry_geocodes.pop(entry_id, None)
+        self._entry_languages.pop(entry_id, None)
+        if self.entry_ids and self._scheduler.bounds != previous:
+            self._async_apply_bounds()
+
+    @callback
+    def _async_apply_bounds(self) -> None:
+        """Fit the current interval into changed bounds and reschedule."""
+        self._interval = self._scheduler.fit(self._interval)
+        self.update_interval = timedelta(
+            seconds=self._gate.jitter(self._interval.total_seconds())
+        )
+        if self._listeners:
+            self._schedule_refresh()
+
+    @property
+    def poll_bounds(self) -> PollBounds:
+        return self._scheduler.bounds
+
+    @property
+    def activity_hot(self) -> bool:
+        return self._scheduler.hot
+
+    @property
+    def request_gate(self) -> RequestGate:
+        return self._gate
+
+    def _merge_response(
+        self, raw_alerts: Optional[List[Dict[str, Any]]], is_delta: bool
+    ) -> Dict[str, Any]:
+        """Fold a response into the alert store and return the hub data."""
+        now = dt_util.utcnow()
+        if raw_alerts is None:
+            changed = False
+        elif is_delta:
+            changed = self._store.apply_delta(raw_alerts)
+        else:
+            self._store.replace(raw_alerts)
+            self._last_full_sync = now
+            changed = True
+        changed = self._store.prune(now) or changed
+
+        # Advance since cursor using latest sent
+        latest_sent = self._extract_latest_sent_iso()
+        if latest_sent:
+            self._since_iso = latest_sent
+
+        # Only write when something the next startup would read changed;
+        # debounced, so a burst of polls results in a single write
+        state = self._persist_state()
+        if changed or state != self._persisted_state:
+            self._persisted_state = state
+            self._persist.async_delay_save(
+                self._data_to_persist, STORAGE_SAVE_DELAY_SECONDS
+            )
+
+        if not changed and self.data is not None:
+            return self.data
+        # New alert set: drop per-language normalization of the previous one
+        self._normalized_cache = {}
+        self._partitions = {}
+        self._area_unions = {}
+        self._location_matches = {}
+        return {"alerts": self._store.alerts()}
+
+    def _extract_latest_sent_iso(self) -> Optional[str]:
+        return self._store.latest_sent()
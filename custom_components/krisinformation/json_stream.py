@@ -0,0 +1,227 @@
+"""Incremental parser for the `alerts` array of a VMA API response."""
+
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Dict, List
+
+# What follows the top-level "alerts" key
+_ALERTS_VALUE = re.compile(r"\s*:\s*\[")
+_ALERTS_VALUE_PARTIAL = re.compile(r"\s*(?::\s*)?\Z")
+_SEPARATORS = re.compile(r"[\s,]*")
+# Characters that change the nesting depth or start a string
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+# Characters that end a string or escape the next one
+_STRING_SPECIAL = re.compile(r'["\\]')
+# A number, true, false or null directly in the array
+_SCALAR = re.compile(r"[^\s,\]]+")
+# A single alert larger than this is treated as a malformed response
+MAX_ALERT_CHARS = 4 * 1024 * 1024
+
+
+class AlertStreamError(ValueError):
+    """The streamed response is not a valid VMA alert list."""
+
+
+class ResponseTooLargeError(AlertStreamError):
+    """The response body exceeds the configured maximum size."""
+
+
+class AlertArrayParser:
+    """Yield the objects of the top-level `alerts` array as bytes arrive.
+
+    Only the current, incomplete alert is buffered, so the full response
+    body never has to be held in memory at once. Complete alerts are
+    decoded with `json.JSONDecoder.raw_decode`. An alert cut off by the end
+    of a chunk is not decoded again on every chunk: its nesting depth and
+    string state are tracked as data arrives and it is decoded once, when
+    its closing brace is in the buffer. Elements that are not objects are
+    skipped, like `hub._decode_alerts` does.
+
+    Before the array, the response object is scanned the same way, so only
+    the `alerts` member of the top-level object is used, not a nested key
+    of that name or one quoted inside a string.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._in_array = False
+        self._done = False
+        # Scan state of the buffered element (or, before the array, of the
+        # response object): where scanning resumes, the nesting depth and
+        # whether that position is inside a string
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        """Consume a chunk of the body and return the alerts it completed."""
+        if self._done:
+            return []
+        self._buffer += self._text.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Signal end of body; raise if the array was left incomplete."""
+        if self._done:
+            return []
+        self._buffer += self._text.decode(b"", final=True)
+        alerts = self._drain(final=True)
+        if self._in_array and not self._done:
+            raise AlertStreamError("Svaret tog slut mitt i listan med larm")
+        return alerts
+
+    def _drain(self, final: bool) -> List[Dict[str, Any]]:
+        buffer = self._buffer
+        if not self._in_array:
+            array_start = self._find_array(buffer)
+            if array_start < 0:
+                # Keep only a string or key cut off by the chunk
+                self._buffer = buffer[self._pos :]
+                self._pos = 0
+                return []
+            self._in_array = True
+            self._depth = self._pos = 0
+            buffer = buffer[array_start:]
+
+        alerts: List[Dict[str, Any]] = []
+        depth = self._depth
+        in_string = self._in_string
+        # Start of the element being received
+        start = 0
+        pos = self._pos
+        end = len(buffer)
+        while pos < end:
+            if in_string:
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = end
+                    break
+                if match.group() == "\\":
+                    if match.end() == end:
+                        # Escaped character still to come
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                in_string = False
+                pos = match.end()
+                if depth == 0:
+                    self._complete(buffer[start:pos], alerts)
+                    start = pos
+            elif depth == 0:
+                pos = _SEPARATORS.match(buffer, pos).end()
+                start = pos
+                if pos >= end:
+                    break
+                char = buffer[pos]
+                if char == "]":
+                    self._done = True
+                    start = pos = end
+                    break
+                if char not in '{["':
+                    match = _SCALAR.match(buffer, pos)
+                    if match.end() == end and not final:
+                        # The scalar may continue in the next chunk
+                        break
+                    pos = match.end()
+                    self._complete(buffer[start:pos], alerts)
+                    start = pos
+                    continue
+                try:
+                    value, pos = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as err:
+                    if final:
+                        raise AlertStreamError(f"Ogiltig JSON i svaret: {err}") from err
+                    # Cut off by the chunk: scan it from here on and decode
+                    # it once it is complete
+                    in_string = char == '"'
+                    depth = 0 if in_string else 1
+                    pos += 1
+                    continue
+                if isinstance(value, dict):
+                    alerts.append(value)
+                start = pos
+            else:
+                match = _STRUCTURAL.search(buffer, pos)
+                if match is None:
+                    pos = end
+                    break
+                pos = match.end()
+                char = match.group()
+                if char == '"':
+                    in_string = True
+                elif char in "{[":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        self._complete(buffer[start:pos], alerts)
+                        start = pos
+
+        if end - start > MAX_ALERT_CHARS:
+            raise AlertStreamError("Ett larm i svaret är orimligt stort")
+        self._buffer = buffer[start:] if start else buffer
+        self._pos = pos - start
+        self._depth = depth
+        self._in_string = in_string
+        return alerts
+
+    def _find_array(self, buffer: str) -> int:
+        """Return where the top-level `alerts` array starts, or -1."""
+        depth = self._depth
+        pos = self._pos
+        end = len(buffer)
+        while pos < end:
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = end
+                break
+            char = match.group()
+            if char != '"':
+                depth += 1 if char in "{[" else -1
+                pos = match.end()
+                continue
+            closed = self._string_end(buffer, match.end())
+            if closed < 0:
+                # Resume at the opening quote once the string is complete
+                pos = match.start()
+                break
+            if depth == 1 and buffer[match.start() : closed] == '"alerts"':
+                value = _ALERTS_VALUE.match(buffer, closed)
+                if value is not None:
+                    return value.end()
+                if _ALERTS_VALUE_PARTIAL.match(buffer, closed):
+                    pos = match.start()
+                    break
+            pos = closed
+        self._depth = depth
+        self._pos = pos
+        return -1
+
+    @staticmethod
+    def _string_end(buffer: str, pos: int) -> int:
+        """Return the index after the quote closing a string, or -1."""
+        while True:
+            match = _STRING_SPECIAL.search(buffer, pos)
+            if match is None:
+                return -1
+            if match.group() == '"':
+                return match.end()
+            pos = match.end() + 1
+            if pos >= len(buffer):
+                return -1
+
+    @staticmethod
+    def _complete(text: str, alerts: List[Dict[str, Any]]) -> None:
+        """Decode one complete array element, keeping it if it is an alert."""
+        try:
+            value = json.loads(text)
+        except ValueError as err:
+            raise AlertStreamError(f"Ogiltig JSON i svaret: {err}") from err
+        if isinstance(value, dict):
+            alerts.append(value)
@@ -0,0 +1,226 @@
+"""Internal alert representation used between the hub and the entries."""
+
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from homeassistant.helpers.json import json_dumps_sorted
+
+from .geometry import AreaGeometry, area_geometry
+from .util import area_geocodes, parse_iso, sanitize_text
+
+# Marks geometry that has not been parsed yet, see Alert.geometry
+_UNPARSED: Any = object()
+
+# Content whose changes are reported: (CAP field name, Alert attribute)
+CONTENT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("event", "event"),
+    ("severity", "severity"),
+    ("urgency", "urgency"),
+    ("certainty", "certainty"),
+    ("headline", "headline"),
+    ("description", "description"),
+    ("instruction", "instruction"),
+    ("effective", "effective_iso"),
+    ("onset", "onset_iso"),
+    ("expires", "expires_iso"),
+    ("web", "web"),
+    ("area", "area"),
+    ("resource", "resource"),
+)
+# One CRC-32 per content field, packed
+_DIGESTS = struct.Struct(f"<{len(CONTENT_FIELDS)}I")
+
+
+def _digest(value: Any) -> int:
+    if value is None:
+        return 0
+    if not isinstance(value, str):
+        value = json_dumps_sorted(value)
+    return zlib.crc32(value.encode())
+
+
+def changed_fields(old: bytes, new: bytes) -> List[str]:
+    """Return the CAP fields whose digests differ between two alerts."""
+    if old == new:
+        return []
+    if len(old) != len(new):
+        return [name for name, _attr in CONTENT_FIELDS]
+    return [
+        name
+        for index, (name, _attr) in enumerate(CONTENT_FIELDS)
+        if old[index * 4 : index * 4 + 4] != new[index * 4 : index * 4 + 4]
+    ]
+
+
+def _intern(value: Any) -> Any:
+    """Intern short enum-like strings shared by many alerts."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Alert:
+    """A normalized CAP alert in the selected language.
+
+    Slots keep the per-alert footprint small, enum-like fields (sender,
+    status, msgType, language, category, urgency, severity, certainty, ...)
+    are interned, and the timestamps and area geocodes are extracted once.
+    Polygons and circles are only parsed when an entry asks for them.
+    `digests` packs a checksum per `CONTENT_FIELDS` entry so content changes
+    within the same msgType can be detected and named without keeping the
+    previous attributes; `content_hash` summarizes them.
+    The nested attribute dict is only built by `as_dict` at the entity
+    boundary.
+    """
+
+    __slots__ = (
+        "identifier",
+        "sender",
+        "status",
+        "msg_type",
+        "scope",
+        "references",
+        "note",
+        "sent_iso",
+        "language",
+        "category",
+        "event",
+        "response_type",
+        "urgency",
+        "severity",
+        "certainty",
+        "effective_iso",
+        "onset_iso",
+        "expires_iso",
+        "headline",
+        "description",
+        "instruction",
+        "contact",
+        "web",
+        "area",
+        "resource",
+        "geocodes",
+        "digests",
+        "content_hash",
+        "sent",
+        "effective",
+        "onset",
+        "expires",
+        "_geometry",
+    )
+
+    def __init__(self, alert: Dict[str, Any], info: Dict[str, Any]) -> None:
+        self.identifier: Optional[str] = alert.get("identifier")
+        self.sender: Optional[str] = _intern(alert.get("sender"))
+        self.status: Optional[str] = _intern(alert.get("status"))
+        self.msg_type: Optional[str] = _intern(alert.get("msgType"))
+        self.scope: Optional[str] = _intern(alert.get("scope"))
+        self.references: Optional[str] = alert.get("references")
+        self.note: Optional[str] = alert.get("note")
+        self.sent_iso: Optional[str] = alert.get("sent")
+        self.language: Optional[str] = _intern(info.get("language"))
+        self.category: Any = _intern(info.get("category"))
+        self.event: Optional[str] = _intern(info.get("event"))
+        self.response_type: Any = _intern(info.get("responseType"))
+        self.urgency: Optional[str] = _intern(info.get("urgency"))
+        self.severity: Optional[str] = _intern(info.get("severity"))
+        self.certainty: Optional[str] = _intern(info.get("certainty"))
+        self.effective_iso: Optional[str] = info.get("effective")
+        self.onset_iso: Optional[str] = info.get("onset")
+        self.expires_iso: Optional[str] = info.get("expires")
+        self.headline: Optional[str] = sanitize_text(info.get("headline"))
+        self.description: Optional[str] = sanitize_text(info.get("description"))
+        self.instruction: Optional[str] = sanitize_text(info.get("instruction"))
+        self.contact: Optional[str] = _intern(info.get("contact"))
+        self.web: Optional[str] = _intern(info.get("web"))
+        self.area: List[Dict[str, Any]] = info.get("area") or []
+        self.resource: List[Dict[str, Any]] = info.get("resource") or []
+        self.geocodes: FrozenSet[str] = area_geocodes(self.area)
+        self.digests: bytes = _DIGESTS.pack(
+            *(_digest(getattr(self, attr)) for _name, attr in CONTENT_FIELDS)
+        )
+        self.content_hash: int = zlib.crc32(self.digests)
+        self.sent: Optional[datetime] = parse_iso(self.sent_iso)
+        self.effective: Optional[datetime] = parse_iso(self.effective_iso)
+        self.onset: Optional[datetime] = parse_iso(self.onset_iso)
+        self.expires: Optional[datetime] = parse_iso(self.expires_iso)
+        self._geometry: Optional[AreaGeometry] = _UNPARSED
+
+    @classmethod
+    def from_cap(cls, alert: Dict[str, Any], language: str) -> "Alert":
+        """Build from a raw CAP alert, picking the info block for `language`."""
+        info_list = alert.get("info") or []
+        info_obj = None
+        for i in info_list:
+            if i and i.get("language") == language:
+                info_obj = i
+                break
+        if info_obj is None and info_list:
+            info_obj = info_list[0]
+        return cls(alert, info_obj or {})
+
+    @property
+    def start(self) -> Optional[datetime]:
+        """Instant from which the alert is active."""
+        return self.effective or self.onset or self.sent
+
+    @property
+    def geometry(self) -> Optional[AreaGeometry]:
+        """Parsed CAP polygons/circles, None if the areas carry none."""
+        if self._geometry is _UNPARSED:
+            self._geometry = area_geometry(self.area)
+        return self._geometry
+
+    def is_active(self, now: datetime) -> bool:
+        if self.expires is not None and now >= self.expires:
+            return False
+        start = self.start
+        if start is not None and now < start:
+            return False
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the small, recorder-friendly representation of the alert."""
+        return {
+            "identifier": self.identifier,
+            "msgType": self.msg_type,
+            "event": self.event,
+            "severity": self.severity,
+            "headline": self.headline,
+            "expires": self.expires_iso,
+        }
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the attribute/event representation of the alert."""
+        return {
+            "identifier": self.identifier,
+            "sender": self.sender,
+            "status": self.status,
+            "msgType": self.msg_type,
+            "scope": self.scope,
+            "references": self.references,
+            "note": self.note,
+            "sent": self.sent_iso,
+            "info": {
+                "language": self.language,
+                "category": self.category,
+                "event": self.event,
+                "responseType": self.response_type,
+                "urgency": self.urgency,
+                "severity": self.severity,
+                "certainty": self.certainty,
+                "effective": self.effective_iso,
+                "onset": self.onset_iso,
+                "expires": self.expires_iso,
+                "headline": self.headline,
+                "description": self.description,
+                "instruction": self.instruction,
+                "contact": self.contact,
+                "web": self.web,
+                "area": self.area,
+                "resource": self.resource,
+            },
+        }
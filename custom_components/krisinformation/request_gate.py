@@ -0,0 +1,109 @@
+"""Domain-wide gate for VMA API requests: shared budget, Retry-After and jitter."""
+
+from __future__ import annotations
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import REQUEST_GATE_DATA_KEY
+
+# Token bucket per API environment: bursts up to BUDGET_BURST requests, then
+# at most BUDGET_REQUESTS per BUDGET_PERIOD_SECONDS
+BUDGET_BURST = 5
+BUDGET_REQUESTS = 30
+BUDGET_PERIOD_SECONDS = 900
+# Scheduled polls are spread by up to ±10 % of their interval
+JITTER_FRACTION = 0.1
+# Retry-After values above this are treated as bogus
+MAX_RETRY_AFTER_SECONDS = 3600
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return seconds from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(int(value))
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            return None
+        seconds = (when - dt_util.utcnow()).total_seconds()
+    if seconds <= 0:
+        return None
+    return min(seconds, MAX_RETRY_AFTER_SECONDS)
+
+
+class RequestGate:
+    """Admit or defer requests for every fetch hub of the integration.
+
+    Each API environment draws from its own token bucket, while a
+    Retry-After seen on any response blocks every request to that host
+    until it has passed.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        *,
+        burst: float = BUDGET_BURST,
+        requests: float = BUDGET_REQUESTS,
+        period_seconds: float = BUDGET_PERIOD_SECONDS,
+    ) -> None:
+        self._clock = clock
+        self._burst = burst
+        self._rate = requests / period_seconds
+        self._blocked_until: Dict[str, float] = {}
+        # budget key -> (tokens, last refill)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self.deferred_requests = 0
+
+    def reserve(self, host: str, budget_key: str) -> Optional[float]:
+        """Take a request slot, or return the seconds to wait for one."""
+        now = self._clock()
+        blocked_until = self._blocked_until.get(host)
+        if blocked_until is not None:
+            if now < blocked_until:
+                self.deferred_requests += 1
+                return blocked_until - now
+            del self._blocked_until[host]
+
+        tokens, last = self._buckets.get(budget_key, (self._burst, now))
+        tokens = min(self._burst, tokens + (now - last) * self._rate)
+        if tokens < 1:
+            self._buckets[budget_key] = (tokens, now)
+            self.deferred_requests += 1
+            return (1 - tokens) / self._rate
+        self._buckets[budget_key] = (tokens - 1, now)
+        return None
+
+    def defer(self, host: str, seconds: float) -> None:
+        """Block all requests to `host` for `seconds` (from Retry-After)."""
+        until = self._clock() + seconds
+        if until > self._blocked_until.get(host, 0):
+            self._blocked_until[host] = until
+
+    def blocked_for(self, host: str) -> float:
+        return max(0.0, self._blocked_until.get(host, 0) - self._clock())
+
+    @staticmethod
+    def jitter(seconds: float) -> float:
+        """Spread `seconds` randomly so pollers do not run in lock-step."""
+        return seconds * random.uniform(1 - JITTER_FRACTION, 1 + JITTER_FRACTION)
+
+
+def get_request_gate(hass: HomeAssistant) -> RequestGate:
+    """Return the integration-wide request gate."""
+    gate = hass.data.get(REQUEST_GATE_DATA_KEY)
+    if gate is None:
+        gate = hass.data[REQUEST_GATE_DATA_KEY] = RequestGate()
+    return gate
@@ -0,0 +1,125 @@
+"""Adaptive polling interval for the shared fetch hub."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from .const import (
+    MAX_UPDATE_INTERVAL_DEFAULT_SECONDS,
+    MIN_UPDATE_INTERVAL_DEFAULT_SECONDS,
+    UPDATE_INTERVAL_DEFAULT_SECONDS,
+)
+from .models import Alert
+
+# Poll at the fastest interval while any of these are active
+HOT_SEVERITIES = frozenset({"Severe", "Extreme"})
+# ... or while an Update message was sent this recently
+RECENT_UPDATE_WINDOW = timedelta(minutes=30)
+# Growth factor per quiet poll, from the normal toward the slowest interval
+QUIET_DECAY = 1.5
+
+
+class PollBounds(NamedTuple):
+    """Polling intervals in seconds requested by one config entry."""
+
+    min_seconds: float = MIN_UPDATE_INTERVAL_DEFAULT_SECONDS
+    normal_seconds: float = UPDATE_INTERVAL_DEFAULT_SECONDS
+    max_seconds: float = MAX_UPDATE_INTERVAL_DEFAULT_SECONDS
+
+
+class AdaptivePollScheduler:
+    """Choose the hub's next poll interval from alert activity.
+
+    Active Severe/Extreme alerts or recent Update messages poll at the
+    fastest interval. Otherwise the interval returns to the normal one and
+    then grows by `QUIET_DECAY` per quiet poll up to the slowest one. Entries
+    sharing the hub each register their bounds; the most demanding wins.
+    """
+
+    def __init__(self) -> None:
+        self._bounds: Dict[str, PollBounds] = {}
+        self._backing_off = False
+        self.hot = False
+
+    def set_bounds(self, entry_id: str, bounds: PollBounds) -> None:
+        self._bounds[entry_id] = bounds
+
+    def remove(self, entry_id: str) -> None:
+        self._bounds.pop(entry_id, None)
+
+    @property
+    def bounds(self) -> PollBounds:
+        if not self._bounds:
+            return PollBounds()
+        min_seconds = min(b.min_seconds for b in self._bounds.values())
+        max_seconds = max(
+            min(b.max_seconds for b in self._bounds.values()), min_seconds
+        )
+        normal_seconds = min(
+            max(min(b.normal_seconds for b in self._bounds.values()), min_seconds),
+            max_seconds,
+        )
+        return PollBounds(min_seconds, normal_seconds, max_seconds)
+
+    @staticmethod
+    def is_hot(alerts: Iterable[Alert], now: datetime) -> bool:
+        for alert in alerts:
+            if alert.severity in HOT_SEVERITIES and alert.is_active(now):
+                return True
+            if (
+                alert.msg_type == "Update"
+                and alert.sent is not None
+                and now - alert.sent <= RECENT_UPDATE_WINDOW
+            ):
+                return True
+        return False
+
+    def fit(self, current: timedelta) -> timedelta:
+        """Interval after the bounds changed, keeping the current activity."""
+        if self._backing_off:
+            return current
+        bounds = self.bounds
+        if self.hot:
+            return timedelta(seconds=bounds.min_seconds)
+        return timedelta(
+            seconds=min(
+                max(current.total_seconds(), bounds.normal_seconds),
+                bounds.max_seconds,
+            )
+        )
+
+    def backoff(self, current: timedelta, retry_after: Optional[float]) -> timedelta:
+        """Interval after a 429: Retry-After if given, else double."""
+        self._backing_off = True
+        wait_seconds = retry_after or current.total_seconds() * 2
+        return timedelta(seconds=min(900, wait_seconds))
+
+    def next_interval(
+        self, current: timedelta, hot: bool, max_age: Optional[float] = None
+    ) -> timedelta:
+        """Interval after a successful (200/304) poll."""
+        bounds = self.bounds
+        current_seconds = current.total_seconds()
+        if hot:
+            target = bounds.min_seconds
+        elif self.hot:
+            # Activity just ended
+            target = bounds.normal_seconds
+        else:
+            target = min(
+                max(current_seconds * QUIET_DECAY, bounds.normal_seconds),
+                bounds.max_seconds,
+            )
+        self.hot = hot
+
+        if max_age:
+            # Polling faster than the server's cache lifetime is wasted
+            target = max(target, min(max_age, bounds.max_seconds))
+
+        if self._backing_off:
+            if current_seconds / 2 > target:
+                # Gradually recover from backoff after successful request
+                return timedelta(seconds=current_seconds / 2)
+            self._backing_off = False
+        return timedelta(seconds=target)
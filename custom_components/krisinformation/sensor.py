@@ -1,6 +1,9 @@
 import logging
-from typing import Any, Dict, List
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -12,6 +15,7 @@ from .const import (
     CONF_MUNICIPALITY,
     DEVICE_MANUFACTURER,
     DEVICE_MODEL,
+    SEVERITY_ORDER,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,6 +30,7 @@ async def async_setup_entry(
     async_add_entities(
         [
             KrisinformationCountSensor(config_entry.entry_id, coordinator),
+            KrisinformationSeveritySensor(config_entry.entry_id, coordinator),
         ],
     )
 
@@ -62,6 +67,9 @@ class _BaseKrisinformationEntity(CoordinatorEntity, SensorEntity):
 
 class KrisinformationCountSensor(_BaseKrisinformationEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
+    # Full CAP payloads stay in the state machine only; use the
+    # krisinformation/alerts websocket command for on-demand details
+    _unrecorded_attributes = frozenset({"alerts"})
 
     @property
     def name(self) -> str:
@@ -75,14 +83,44 @@ class KrisinformationCountSensor(_BaseKrisinformationEntity):
     @property
     def state(self) -> int:
         data = self.coordinator.data or {}
-        alerts: List[Dict[str, Any]] = data.get("alerts") or []
-        return len(alerts)
+        return len(data.get("alerts") or [])
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data or {}
-        alerts: List[Dict[str, Any]] = data.get("alerts") or []
-        # Expose full CAP list for dashboards/automation templates
-        return {"alerts": alerts}
+        # Expose full CAP list for dashboards/automation templates; only the
+        # summary is recorded (see _unrecorded_attributes)
+        return {
+            "alerts": self.coordinator.alert_attributes(),
+            "alert_summary": self.coordinator.alert_summary(),
+            # Pre-computed so templates don't have to walk `alerts`
+            **self.coordinator.alert_aggregates(),
+        }
 
     # Note: The former list sensor has been merged into this count sensor.
+
+
+class KrisinformationSeveritySensor(_BaseKrisinformationEntity):
+    """Highest severity among the entry's alerts, unknown when there are none."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = SEVERITY_ORDER
+
+    @property
+    def name(self) -> str:
+        return f"{self._base_name} högsta allvarlighetsgrad ({self._municipality})"
+
+    @property
+    def unique_id(self) -> str:
+        return f"krisinformation_severity_{self._sanitized}_{self._entry_id}"
+
+    @property
+    def native_value(self):
+        return self.coordinator.alert_aggregates()["highest_severity"]
+
+    @property
+    def extra_state_attributes(self):
+        aggregates = self.coordinator.alert_aggregates()
+        return {
+            "severity_counts": aggregates["severity_counts"],
+            "next_expiry": aggregates["next_expiry"],
+        }
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+import random
+from typing import Any
+
+import pytest
+
+_SEVERITIES = ["Minor", "Moderate", "Severe", "Extreme"]
+_MSG_TYPES = ["Alert", "Alert", "Alert", "Update", "Cancel"]
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+
+def _make_cap_payload(
+    count: int,
+    *,
+    languages: tuple[str, ...] = ("sv-SE", "en-US"),
+    areas_per_alert: int = 2,
+    resources_per_alert: int = 1,
+    now: datetime | None = None,
+    seed: int = 1,
+) -> dict[str, Any]:
+    """Build a synthetic VMA v3 response with `count` alerts."""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    alerts = []
+    for n in range(count):
+        sent = now - timedelta(minutes=rng.randint(0, 600))
+        expires = sent + timedelta(hours=rng.choice([-1, 2, 6, 24]))
+        county = f"{rng.randint(1, 25):02d}"
+        areas = [
+            {
+                "areaDesc": f"Område {n}-{a}",
+                "geocode": [
+                    {
+                        "valueName": "Kommun",
+                        "value": f"{county}{rng.randint(0, 99):02d}",
+                    }
+                ],
+            }
+            for a in range(areas_per_alert)
+        ]
+        resources = [
+            {
+                "resourceDesc": f"Resurs {r}",
+                "mimeType": "text/html",
+                "uri": f"https://example.invalid/{n}/{r}",
+            }
+            for r in range(resources_per_alert)
+        ]
+        alerts.append(
+            {
+                "identifier": f"SRVMA{n:06d}",
+                "sender": "https://vmaapi.sr.se",
+                "sent": _iso(sent),
+                "status": "Actual",
+                "msgType": rng.choice(_MSG_TYPES),
+                "scope": "Public",
+                "references": None,
+                "note": None,
+                "info": [
+                    {
+                        "language": language,
+                        "category": "Safety",
+                        "event": "Viktigt meddelande till allmänheten",
+                        "urgency": "Immediate",
+                        "severity": rng.choice(_SEVERITIES),
+                        "certainty": "Observed",
+                        "effective": _iso(sent),
+                        "onset": _iso(sent),
+                        "expires": _iso(expires),
+                        "headline": f"Rubrik {n}\r\n  ({language})",
+                        "description": "Beskrivning\r\n\r\n  " * 10,
+                        "instruction": "Gå inomhus, stäng dörrar och fönster.",
+                        "contact": "SOS Alarm",
+                        "web": "https://www.krisinformation.se",
+                        "area": areas,
+                        "resource": resources,
+                    }
+                    for language in languages
+                ],
+            }
+        )
+    return {"alerts": alerts}
+
+
+@pytest.fixture(scope="session")
+def cap_payload() -> Callable[..., dict[str, Any]]:
+    """Return the synthetic VMA payload factory."""
+    return _make_cap_payload
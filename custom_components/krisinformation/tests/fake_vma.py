@@ -0,0 +1,187 @@
+"""Local stand-in for the VMA v3 API used by the load harness and tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import json
+from typing import Any
+
+from aiohttp import web
+
+from custom_components.krisinformation.util import parse_iso
+
+PATHS = {"production": "/api/v3/alerts", "test": "/testapi/v3/alerts"}
+
+
+@dataclass
+class Scenario:
+    """Misbehaviour the fake server should show."""
+
+    # Seconds to wait before answering each request
+    latency: float = 0.0
+    # Answer every Nth request with 429 (0 disables)
+    rate_limit_every: int = 0
+    # Retry-After sent with those 429 responses, None to omit the header
+    retry_after: int | None = 30
+    # Ignore If-None-Match/If-Modified-Since and always answer 200
+    ignore_validators: bool = False
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    bytes_sent: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    delta_requests: int = 0
+
+
+class _Feed:
+    """Alert set of one API environment with its validators."""
+
+    def __init__(self) -> None:
+        self.alerts: dict[str, dict[str, Any]] = {}
+        self.version = 0
+        self.modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def touch(self) -> None:
+        self.version += 1
+        # Last-Modified has second resolution; keep it strictly increasing
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.modified = max(now, self.modified + timedelta(seconds=1))
+
+    @property
+    def etag(self) -> str:
+        return f'W/"vma-{self.version}"'
+
+
+def _alert_geocodes(alert: dict[str, Any]) -> set[str]:
+    return {
+        str(code.get("value"))
+        for info in alert.get("info") or []
+        for area in info.get("area") or []
+        for code in area.get("geocode") or []
+        if code.get("value")
+    }
+
+
+class FakeVmaServer:
+    """aiohttp server answering like `vmaapi.sr.se` for both environments.
+
+    Supports the `since` and `geocode` query parameters, ETag and
+    Last-Modified validators with 304 responses, and the failure modes in
+    `Scenario`. Use `publish`/`load` to change the served alerts.
+    """
+
+    def __init__(self, scenario: Scenario | None = None) -> None:
+        self.scenario = scenario or Scenario()
+        self.stats = ServerStats()
+        self._feeds = {env: _Feed() for env in PATHS}
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+
+    def url(self, env: str = "production") -> str:
+        return f"http://127.0.0.1:{self.port}{PATHS[env]}"
+
+    async def start(self) -> None:
+        app = web.Application()
+        for env, path in PATHS.items():
+            app.router.add_get(path, self._make_handler(env))
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeVmaServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    def load(self, payload: dict[str, Any], env: str = "production") -> None:
+        """Replace the served alert set with a full VMA response body."""
+        feed = self._feeds[env]
+        feed.alerts = {a["identifier"]: a for a in payload.get("alerts") or []}
+        feed.touch()
+
+    def publish(self, alert: dict[str, Any], env: str = "production") -> None:
+        """Add or replace a single alert."""
+        feed = self._feeds[env]
+        feed.alerts[alert["identifier"]] = alert
+        feed.touch()
+
+    def _make_handler(self, env: str):
+        async def handle(request: web.Request) -> web.StreamResponse:
+            return await self._handle(env, request)
+
+        return handle
+
+    async def _handle(self, env: str, request: web.Request) -> web.StreamResponse:
+        scenario = self.scenario
+        self.stats.requests += 1
+        if scenario.latency:
+            await asyncio.sleep(scenario.latency)
+
+        if scenario.rate_limit_every and (
+            self.stats.requests % scenario.rate_limit_every == 0
+        ):
+            headers = {}
+            if scenario.retry_after is not None:
+                headers["Retry-After"] = str(scenario.retry_after)
+            return self._respond(web.Response(status=429, headers=headers))
+
+        feed = self._feeds[env]
+        validators = {
+            "ETag": feed.etag,
+            "Last-Modified": format_datetime(feed.modified, usegmt=True),
+        }
+        if not scenario.ignore_validators and self._not_modified(request, feed):
+            return self._respond(web.Response(status=304, headers=validators))
+
+        alerts = list(feed.alerts.values())
+        since = parse_iso(request.query.get("since"))
+        if since is not None:
+            self.stats.delta_requests += 1
+            alerts = [a for a in alerts if (parse_iso(a.get("sent")) or since) >= since]
+        geocode = request.query.get("geocode")
+        if geocode:
+            alerts = [
+                a
+                for a in alerts
+                if any(
+                    c == "00" or c.startswith(geocode) or geocode.startswith(c)
+                    for c in _alert_geocodes(a)
+                )
+            ]
+        body = json.dumps({"alerts": alerts}).encode()
+        return self._respond(
+            web.Response(body=body, content_type="application/json", headers=validators)
+        )
+
+    @staticmethod
+    def _not_modified(request: web.Request, feed: _Feed) -> bool:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return if_none_match == feed.etag
+        if_modified_since = request.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since) >= feed.modified
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _respond(self, response: web.Response) -> web.Response:
+        self.stats.statuses[response.status] += 1
+        self.stats.bytes_sent += len(response.body or b"")
+        return response
@@ -0,0 +1,235 @@
+"""Drive N config entries against `FakeVmaServer` and measure the cost.
+
+Used by `test_load_harness.py`; set KRISINFORMATION_LOAD_TEST=1 to run the
+heavy scenarios there and print their reports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import statistics
+import time
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import Event, HomeAssistant, callback
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.const import (
+    CONF_API_ENV,
+    CONF_INCLUDE_UPDATE_CANCEL,
+    CONF_MUNICIPALITY,
+    CONF_SEVERITY_MIN,
+    DOMAIN,
+    EVENT_NEW_ALERT,
+    HUB_DATA_KEY,
+    MUNICIPALITY_DEFAULT,
+    MUNICIPALITY_OPTIONS,
+    REQUEST_GATE_DATA_KEY,
+)
+from custom_components.krisinformation.event_dispatcher import FLUSH_INTERVAL_SECONDS
+from custom_components.krisinformation.request_gate import RequestGate
+
+from fake_vma import FakeVmaServer
+
+
+class LoopBlockMonitor:
+    """Measure how long the event loop fails to wake a periodic sleeper."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.blocked_seconds = 0.0
+        self.max_block = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            if lag > 0.001:
+                self.blocked_seconds += lag
+                self.max_block = max(self.max_block, lag)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+@dataclass
+class LoadReport:
+    entries: int
+    polls: int
+    duration: float
+    requests: int
+    bytes_sent: int
+    statuses: dict[int, int]
+    loop_blocked_seconds: float
+    max_loop_block: float
+    latencies: list[float] = field(default_factory=list)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def format(self) -> str:
+        latency = (
+            f"p50 {statistics.median(self.latencies) * 1000:.1f} ms, "
+            f"max {max(self.latencies) * 1000:.1f} ms"
+            if self.latencies
+            else "n/a"
+        )
+        return (
+            f"{self.entries} entries, {self.polls} polls in {self.duration:.2f} s: "
+            f"{self.requests} requests ({self.requests_per_second:.1f}/s), "
+            f"{self.bytes_sent / 1024:.1f} KiB, statuses {self.statuses}, "
+            f"loop blocked {self.loop_blocked_seconds * 1000:.1f} ms "
+            f"(max {self.max_loop_block * 1000:.1f} ms), alert latency {latency}"
+        )
+
+
+def load_alert(identifier: str, now: datetime | None = None) -> dict[str, Any]:
+    """Return a nationwide alert every entry will report."""
+    now = now or datetime.now(timezone.utc)
+    sent = now.replace(microsecond=0).isoformat()
+    return {
+        "identifier": identifier,
+        "sender": "https://vmaapi.sr.se",
+        "sent": sent,
+        "status": "Actual",
+        "msgType": "Alert",
+        "scope": "Public",
+        "info": [
+            {
+                "language": "sv-SE",
+                "event": "Viktigt meddelande till allmänheten",
+                "severity": "Moderate",
+                "urgency": "Immediate",
+                "certainty": "Observed",
+                "effective": sent,
+                "expires": (now + timedelta(hours=2))
+                .replace(microsecond=0)
+                .isoformat(),
+                "headline": f"Lasttest {identifier}",
+                "area": [
+                    {
+                        "areaDesc": "Hela Sverige",
+                        "geocode": [{"valueName": "Kommun", "value": "00"}],
+                    }
+                ],
+            }
+        ],
+    }
+
+
+async def run_load(
+    hass: HomeAssistant,
+    server: FakeVmaServer,
+    *,
+    entries: int = 15,
+    polls: int = 10,
+    api_env: str = "production",
+) -> LoadReport:
+    """Set up `entries` entries, publish one alert per poll and report.
+
+    Polls are triggered directly on the shared hub instead of waiting for
+    the scheduled interval; latency is measured from publishing an alert on
+    the server until the new-alert event covering every entry is fired,
+    including the time the event dispatcher holds back bursts.
+    """
+    received: dict[str, list[float]] = {}
+
+    @callback
+    def _on_new_alert(event: Event) -> None:
+        # One event per alert, listing every entry it concerns
+        received.setdefault(event.data["identifier"], []).extend(
+            [time.perf_counter()] * len(event.data["entry_ids"])
+        )
+
+    # Measure raw throughput, not the production request budget
+    hass.data[REQUEST_GATE_DATA_KEY] = RequestGate(burst=10**9, requests=10**9)
+    municipalities = [m for m in MUNICIPALITY_OPTIONS if m != MUNICIPALITY_DEFAULT]
+    monitor = LoopBlockMonitor()
+    latencies: list[float] = []
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch.object(hub_module, "PRODUCTION_BASE_URL", server.url("production"))
+        )
+        stack.enter_context(
+            patch.object(hub_module, "TEST_BASE_URL", server.url("test"))
+        )
+        unsub = hass.bus.async_listen(EVENT_NEW_ALERT, _on_new_alert)
+        monitor.start()
+        started = time.perf_counter()
+        try:
+            for n in range(entries):
+                entry = MockConfigEntry(
+                    domain=DOMAIN,
+                    version=3,
+                    title=f"Last {n}",
+                    data={
+                        CONF_NAME: f"Last {n}",
+                        CONF_MUNICIPALITY: municipalities[n % len(municipalities)],
+                    },
+                    options={
+                        CONF_API_ENV: api_env,
+                        CONF_SEVERITY_MIN: "Minor",
+                        CONF_INCLUDE_UPDATE_CANCEL: True,
+                    },
+                )
+                entry.add_to_hass(hass)
+                assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+            fetch_hub = hass.data[HUB_DATA_KEY][api_env]
+            # The startup fetch runs as a background task; let it finish
+            await fetch_hub.async_startup_refresh()
+            for poll in range(polls):
+                identifier = f"LOAD{poll:05d}"
+                published = time.perf_counter()
+                server.publish(load_alert(identifier), api_env)
+                await fetch_hub.async_refresh()
+                await hass.async_block_till_done()
+                # Back-to-back polls are a burst: wait for the held flush
+                deadline = time.perf_counter() + FLUSH_INTERVAL_SECONDS + 1
+                while (
+                    len(received.get(identifier) or []) < entries
+                    and time.perf_counter() < deadline
+                ):
+                    await asyncio.sleep(0.01)
+                times = received.get(identifier) or []
+                if len(times) >= entries:
+                    latencies.append(max(times) - published)
+            duration = time.perf_counter() - started
+        finally:
+            await monitor.stop()
+            unsub()
+            for entry in hass.config_entries.async_entries(DOMAIN):
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+    return LoadReport(
+        entries=entries,
+        polls=polls,
+        duration=duration,
+        requests=server.stats.requests,
+        bytes_sent=server.stats.bytes_sent,
+        statuses=dict(server.stats.statuses),
+        loop_blocked_seconds=monitor.blocked_seconds,
+        max_loop_block=monitor.max_block,
+        latencies=latencies,
+    )
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from custom_components.krisinformation import KrisinformationDataUpdateCoordinator
+from custom_components.krisinformation.const import EVENT_CHANGED_ALERT
+from custom_components.krisinformation.models import Alert, changed_fields
+
+
+def _alert(identifier: str, sent: str, msg_type: str = "Alert") -> Alert:
+    return Alert.from_cap(
+        {"identifier": identifier, "sent": sent, "msgType": msg_type, "info": []},
+        "sv-SE",
+    )
+
+
+def test_alert_delta_reports_added_updated_removed() -> None:
+    previous = [
+        _alert("a1", "2025-01-01T10:00:00Z"),
+        _alert("a2", "2025-01-01T10:00:00Z"),
+    ]
+    current = [
+        _alert("a2", "2025-01-01T11:00:00Z", msg_type="Update"),
+        _alert("a3", "2025-01-01T11:00:00Z"),
+    ]
+
+    serialized = [a.as_dict() for a in current]
+    delta = KrisinformationDataUpdateCoordinator._alert_delta(
+        previous, current, serialized
+    )
+
+    assert [a["identifier"] for a in delta["added"]] == ["a3"]
+    assert [a["identifier"] for a in delta["updated"]] == ["a2"]
+    assert delta["removed"] == ["a1"]
+    # The serialized attributes are reused, not built again
+    assert delta["updated"][0] is serialized[0]
+    assert delta["added"][0] is serialized[1]
+
+
+def test_alert_delta_is_empty_for_same_set() -> None:
+    alerts = [_alert("a1", "2025-01-01T10:00:00Z")]
+    same = [_alert("a1", "2025-01-01T10:00:00Z")]
+
+    delta = KrisinformationDataUpdateCoordinator._alert_delta(
+        alerts, same, [a.as_dict() for a in same]
+    )
+
+    assert delta == {"added": [], "updated": [], "removed": []}
+
+
+def _info_alert(**info) -> Alert:
+    raw = {"identifier": "a1", "msgType": "Alert", "info": [info]}
+    return Alert.from_cap(raw, "sv-SE")
+
+
+def test_content_changes_are_named() -> None:
+    before = _info_alert(headline="Brand", severity="Minor", area=[{"areaDesc": "A"}])
+    same = _info_alert(headline="Brand", severity="Minor", area=[{"areaDesc": "A"}])
+    after = _info_alert(headline="Brand", severity="Severe", area=[{"areaDesc": "B"}])
+
+    assert same.content_hash == before.content_hash
+    assert after.content_hash != before.content_hash
+    assert changed_fields(before.digests, same.digests) == []
+    assert changed_fields(before.digests, after.digests) == ["severity", "area"]
+
+    # Same msgType, new content: one change event naming the fields
+    queued = []
+    fake = SimpleNamespace(
+        config_entry=SimpleNamespace(entry_id="e1"),
+        _events=SimpleNamespace(
+            async_queue=lambda event_type, alert, entry_id, changed=None: (
+                queued.append((event_type, changed))
+            )
+        ),
+    )
+    emit = KrisinformationDataUpdateCoordinator._emit_events
+    emit(fake, {"a1": "Alert"}, [after], {"a1": before.digests})
+    assert queued == [(EVENT_CHANGED_ALERT, ["severity", "area"])]
+
+    queued.clear()
+    emit(fake, {"a1": "Alert"}, [same], {"a1": before.digests})
+    assert queued == []
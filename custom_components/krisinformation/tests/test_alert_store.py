@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from custom_components.krisinformation.alert_store import (
+    AlertStore,
+    referenced_identifiers,
+)
+
+
+def _alert(identifier: str, sent: str, msg_type: str = "Alert", **extra) -> dict:
+    return {
+        "identifier": identifier,
+        "sender": "https://vmaapi.sr.se",
+        "sent": sent,
+        "msgType": msg_type,
+        "info": [{"language": "sv-SE", "expires": "2030-01-01T00:00:00+00:00"}],
+        **extra,
+    }
+
+
+def test_referenced_identifiers_parses_triplets() -> None:
+    refs = "sender,a1,2025-01-01T00:00:00Z sender,a2,2025-01-02T00:00:00Z"
+    assert referenced_identifiers(refs) == ["a1", "a2"]
+    assert referenced_identifiers(None) == []
+
+
+def test_delta_keeps_full_active_set() -> None:
+    store = AlertStore()
+    store.replace([_alert("a1", "2025-01-01T10:00:00Z")])
+
+    changed = store.apply_delta([_alert("a2", "2025-01-01T11:00:00Z")])
+
+    assert changed is True
+    assert [a["identifier"] for a in store.alerts()] == ["a1", "a2"]
+
+
+def test_repeated_delta_is_not_a_change() -> None:
+    store = AlertStore()
+    a1 = _alert("a1", "2025-01-01T10:00:00Z")
+    store.replace([a1])
+
+    assert store.apply_delta([dict(a1)]) is False
+
+
+def test_update_and_cancel_supersede_referenced_alert() -> None:
+    store = AlertStore()
+    store.replace([_alert("a1", "2025-01-01T10:00:00Z")])
+
+    store.apply_delta(
+        [
+            _alert(
+                "u1",
+                "2025-01-01T11:00:00Z",
+                msg_type="Update",
+                references="s,a1,2025-01-01T10:00:00Z",
+            )
+        ]
+    )
+    assert [a["identifier"] for a in store.alerts()] == ["u1"]
+
+    store.apply_delta(
+        [
+            _alert(
+                "c1",
+                "2025-01-01T12:00:00Z",
+                msg_type="Cancel",
+                references="s,u1,2025-01-01T11:00:00Z",
+            ),
+            # A late copy of the original must not resurrect it
+            _alert("a1", "2025-01-01T10:00:00Z"),
+        ]
+    )
+    assert [a["identifier"] for a in store.alerts()] == ["c1"]
+
+
+def test_prune_drops_expired_alerts() -> None:
+    store = AlertStore()
+    expired = _alert("old", "2025-01-01T10:00:00Z")
+    expired["info"][0]["expires"] = "2025-01-01T12:00:00+00:00"
+    store.replace([expired, _alert("a1", "2025-01-01T10:00:00Z")])
+
+    assert store.prune(datetime(2025, 1, 2, tzinfo=timezone.utc)) is True
+    assert [a["identifier"] for a in store.alerts()] == ["a1"]
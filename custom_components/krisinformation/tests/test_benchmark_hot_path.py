@@ -0,0 +1,143 @@
+"""Time and peak memory of each per-poll stage at 10, 1k and 10k alerts.
+
+Run with `KRISINFORMATION_BENCHMARK=1 pytest --benchmark-group-by=group
+--benchmark-columns=mean,max` and compare `extra_info.peak_kib` (tracemalloc
+peak of one call) in `--benchmark-json` output. Works offline on synthetic
+payloads. Normalization is measured for a full fetch, a delta poll and the
+executor path that normalizes every language in use.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import os
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("KRISINFORMATION_BENCHMARK"),
+    reason="set KRISINFORMATION_BENCHMARK=1 to run benchmarks",
+)
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.krisinformation import (  # noqa: E402
+    KrisinformationDataUpdateCoordinator,
+)
+from custom_components.krisinformation.alert_store import AlertStore  # noqa: E402
+from custom_components.krisinformation.filters import AlertFilter  # noqa: E402
+from custom_components.krisinformation.hub import (  # noqa: E402
+    _normalize_incremental,
+    _normalize_languages,
+)
+from custom_components.krisinformation.models import Alert  # noqa: E402
+
+SIZES = [10, 1_000, 10_000]
+FILTERS = {"active_only": True, "include_update_cancel": True, "severity_min": "Minor"}
+
+
+@pytest.fixture(scope="module")
+def raw_alerts(cap_payload) -> Callable[[int], list[dict[str, Any]]]:
+    @lru_cache(maxsize=None)
+    def _raw_alerts(count: int) -> list[dict[str, Any]]:
+        # Two languages, many areas and resources per alert
+        payload = cap_payload(count, areas_per_alert=8, resources_per_alert=4)
+        return payload["alerts"]
+
+    return _raw_alerts
+
+
+def _normalize(raw: list[dict[str, Any]]) -> list[Alert]:
+    return _normalize_incremental(raw, "sv-SE", {})[0]
+
+
+def _record_peak(benchmark, func: Callable[..., Any], *args: Any) -> None:
+    tracemalloc.start()
+    try:
+        func(*args)
+        _size, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_kib"] = round(peak / 1024, 1)
+
+
+def _fake_coordinator() -> SimpleNamespace:
+    fired: list[str] = []
+
+    def _queue(event_type: str, alert: Any, entry_id: str, changed: Any = None) -> None:
+        fired.append(event_type)
+
+    events = SimpleNamespace(async_queue=_queue)
+    return SimpleNamespace(
+        config_entry=SimpleNamespace(entry_id="bench"), _events=events, fired=fired
+    )
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_normalize(benchmark, raw_alerts, count: int) -> None:
+    # Full fetch: every alert is new
+    raw = raw_alerts(count)
+    benchmark.group = "normalize"
+    _record_peak(benchmark, _normalize_incremental, raw, "sv-SE", {})
+    result, _objects = benchmark(_normalize_incremental, raw, "sv-SE", {})
+    assert len(result) == count
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_normalize_delta(benchmark, raw_alerts, count: int) -> None:
+    # Poll after a delta: one alert replaced, the rest reused
+    raw = list(raw_alerts(count))
+    _alerts, previous = _normalize_incremental(raw, "sv-SE", {})
+    raw[-1] = dict(raw[-1])
+    benchmark.group = "normalize-delta"
+    _record_peak(benchmark, _normalize_incremental, raw, "sv-SE", previous)
+    result, _objects = benchmark(_normalize_incremental, raw, "sv-SE", previous)
+    assert len(result) == count
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_normalize_languages(benchmark, raw_alerts, count: int) -> None:
+    # Executor path for a large full fetch, both languages of the payload
+    raw = raw_alerts(count)
+    languages = {"sv-SE", "en-US"}
+    benchmark.group = "normalize-languages"
+    _record_peak(benchmark, _normalize_languages, raw, languages, {})
+    result = benchmark(_normalize_languages, raw, languages, {})
+    assert {len(alerts) for alerts, _objects in result.values()} == {count}
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_filter(benchmark, raw_alerts, count: int) -> None:
+    alerts = _normalize(raw_alerts(count))
+    now = dt_util.utcnow()
+    apply_filters = AlertFilter(**FILTERS).apply
+    benchmark.group = "filter"
+    _record_peak(benchmark, apply_filters, alerts, now)
+    result = benchmark(apply_filters, alerts, now)
+    assert len(result) <= count
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_extract_latest_sent(benchmark, raw_alerts, count: int) -> None:
+    store = AlertStore()
+    store.replace(raw_alerts(count))
+    benchmark.group = "extract"
+    _record_peak(benchmark, store.latest_sent)
+    assert benchmark(store.latest_sent)
+
+
+@pytest.mark.parametrize("count", SIZES)
+def test_emit_events(benchmark, raw_alerts, count: int) -> None:
+    alerts = _normalize(raw_alerts(count))
+    # Half of the set was already seen, the rest is new
+    previous = {a.identifier: a.msg_type for a in alerts[: count // 2]}
+    fake = _fake_coordinator()
+    emit = KrisinformationDataUpdateCoordinator._emit_events
+    benchmark.group = "emit"
+    _record_peak(benchmark, emit, fake, previous, alerts)
+    benchmark(emit, fake, previous, alerts)
+    assert fake.fired
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_NAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.const import (
+    API_ENV_PRODUCTION,
+    CONF_API_ENV,
+    CONF_MUNICIPALITY,
+    DOMAIN,
+    HUB_DATA_KEY,
+)
+
+from fake_vma import FakeVmaServer, Scenario
+from load_harness import load_alert
+
+
+def _entry(municipality: str) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        title=municipality,
+        data={CONF_NAME: "Krisinformation", CONF_MUNICIPALITY: municipality},
+        options={CONF_API_ENV: API_ENV_PRODUCTION},
+    )
+
+
+@pytest.mark.asyncio
+async def test_setup_does_not_wait_for_first_fetch(
+    hass, enable_custom_integrations, socket_enabled
+) -> None:
+    async with FakeVmaServer(Scenario(latency=2)) as server:
+        server.publish(load_alert("A1"))
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            first = _entry("Hela Sverige")
+            first.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(first.entry_id)
+            # Let the background fetch start and take the hub's refresh lock
+            for _ in range(10):
+                if server.stats.requests:
+                    break
+                await asyncio.sleep(0.05)
+            hub = hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION]
+            assert server.stats.requests == 1
+            assert hub.data is None
+
+            second = _entry("Stockholms län")
+            second.add_to_hass(hass)
+            async with asyncio.timeout(1):
+                assert await hass.config_entries.async_setup(second.entry_id)
+            assert hub.data is None
+
+            # The first fetch completes on its own and serves both entries
+            async with asyncio.timeout(5):
+                while hub.data is None:
+                    await asyncio.sleep(0.05)
+            await hass.async_block_till_done()
+            assert hass.states.get("sensor.krisinformation_stockholms_lan").state == "1"
+
+            for entry in (first, second):
+                assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
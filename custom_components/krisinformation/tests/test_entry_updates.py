@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_NAME
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.const import (
+    API_ENV_PRODUCTION,
+    CONF_API_ENV,
+    CONF_MUNICIPALITY,
+    DOMAIN,
+    HUB_DATA_KEY,
+)
+
+from fake_vma import FakeVmaServer
+from load_harness import load_alert
+
+SENSOR = "sensor.krisinformation_hela_sverige"
+
+
+async def _setup_entry(hass, server: FakeVmaServer) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        title="Hela Sverige",
+        data={CONF_NAME: "Krisinformation", CONF_MUNICIPALITY: "Hela Sverige"},
+        options={CONF_API_ENV: API_ENV_PRODUCTION},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION].async_startup_refresh()
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_boundary_timer_refilters_without_polling(
+    hass, enable_custom_integrations, socket_enabled, freezer
+) -> None:
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    freezer.move_to(now)
+    # Both boundaries fall before the hub's next poll
+    effective = now + timedelta(seconds=30)
+    expires = now + timedelta(seconds=90)
+    alert = load_alert("A1", now)
+    alert["info"][0]["effective"] = effective.isoformat()
+    alert["info"][0]["expires"] = expires.isoformat()
+
+    async with FakeVmaServer() as server:
+        server.publish(alert)
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            entry = await _setup_entry(hass, server)
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            requests = server.stats.requests
+            assert hass.states.get(SENSOR).state == "0"
+            assert coordinator.next_boundary == effective
+
+            # Became effective: reported from the cached set
+            freezer.move_to(effective + timedelta(seconds=1))
+            async_fire_time_changed(hass, effective + timedelta(seconds=1))
+            await hass.async_block_till_done()
+            assert hass.states.get(SENSOR).state == "1"
+            assert coordinator.next_boundary == expires
+
+            # Expired: gone again
+            freezer.move_to(expires + timedelta(seconds=1))
+            async_fire_time_changed(hass, expires + timedelta(seconds=1))
+            await hass.async_block_till_done()
+            assert hass.states.get(SENSOR).state == "0"
+            assert coordinator.next_boundary is None
+            assert server.stats.requests == requests
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_hub_data_is_not_published(
+    hass, enable_custom_integrations, socket_enabled
+) -> None:
+    alert = load_alert("A1")
+    async with FakeVmaServer() as server:
+        server.publish(alert)
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            entry = await _setup_entry(hass, server)
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            hub = hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION]
+
+            with patch.object(
+                coordinator,
+                "async_set_updated_data",
+                wraps=coordinator.async_set_updated_data,
+            ) as set_updated:
+                # Same alert set again (delta, then 304)
+                await hub.async_refresh()
+                await hub.async_refresh()
+                assert server.stats.statuses[304] == 1
+                set_updated.assert_not_called()
+                assert coordinator.skipped_updates == 2
+
+                # Same identifier, msgType and sent, new text: published
+                changed = {**alert, "info": [dict(alert["info"][0])]}
+                changed["info"][0]["headline"] = "Ny rubrik"
+                server.publish(changed)
+                await hub.async_refresh()
+                set_updated.assert_called_once()
+            assert [a.headline for a in coordinator.data["alerts"]] == ["Ny rubrik"]
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.krisinformation.const import (
+    EVENT_CANCELED_ALERT,
+    EVENT_CHANGED_ALERT,
+    EVENT_NEW_ALERT,
+)
+from custom_components.krisinformation.event_dispatcher import AlertEventDispatcher
+from custom_components.krisinformation.models import Alert
+
+
+def _alert(
+    identifier: str, msg_type: str = "Alert", language: str = "sv-SE", **info
+) -> Alert:
+    info = {"language": language, **info}
+    raw = {"identifier": identifier, "msgType": msg_type, "info": [info]}
+    return Alert.from_cap(raw, language)
+
+
+def _listen(hass, event_type: str) -> list:
+    events: list = []
+
+    @callback
+    def _record(event) -> None:
+        events.append(event)
+
+    hass.bus.async_listen(event_type, _record)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_one_event_per_transition(hass) -> None:
+    new = _listen(hass, EVENT_NEW_ALERT)
+    canceled = _listen(hass, EVENT_CANCELED_ALERT)
+    changed = _listen(hass, EVENT_CHANGED_ALERT)
+    dispatcher = AlertEventDispatcher(hass)
+
+    for entry_id in ("a", "b", "c", "a"):
+        dispatcher.async_queue(EVENT_NEW_ALERT, _alert("X"), entry_id)
+    # Entries in another language get the alert in their language
+    dispatcher.async_queue(EVENT_NEW_ALERT, _alert("X", language="en-US"), "d")
+    dispatcher.async_queue(EVENT_CANCELED_ALERT, _alert("X", "Cancel"), "a")
+    dispatcher.async_queue(EVENT_CHANGED_ALERT, _alert("Y"), "a", changed=["area"])
+    dispatcher.async_queue(
+        EVENT_CHANGED_ALERT, _alert("Y"), "b", changed=["expires", "area"]
+    )
+    await hass.async_block_till_done()
+
+    assert [(e.data["info"]["language"], e.data["entry_ids"]) for e in new] == [
+        ("sv-SE", ["a", "b", "c"]),
+        ("en-US", ["d"]),
+    ]
+    assert {e.data["identifier"] for e in new} == {"X"}
+    assert len(canceled) == 1
+    assert [e.data["changed"] for e in changed] == [["area", "expires"]]
+    assert dispatcher.stats() == {"pending": 0, "fired": 4, "merged": 4}
+
+
+@pytest.mark.asyncio
+async def test_change_merged_into_unseen_transition(hass) -> None:
+    new = _listen(hass, EVENT_NEW_ALERT)
+    changed = _listen(hass, EVENT_CHANGED_ALERT)
+    dispatcher = AlertEventDispatcher(hass)
+
+    dispatcher.async_queue(EVENT_CHANGED_ALERT, _alert("X"), "a", changed=["area"])
+    dispatcher.async_queue(EVENT_NEW_ALERT, _alert("X", headline="Ny"), "b")
+    await hass.async_block_till_done()
+
+    assert changed == []
+    assert [e.data["entry_ids"] for e in new] == [["a", "b"]]
+    assert new[0].data["info"]["headline"] == "Ny"
+    assert "changed" not in new[0].data
+
+
+@pytest.mark.asyncio
+async def test_bursts_are_bounded_newest_first(hass) -> None:
+    new = _listen(hass, EVENT_NEW_ALERT)
+    dispatcher = AlertEventDispatcher(hass, max_events=20, interval=1.0)
+
+    for n in range(50):
+        dispatcher.async_queue(EVENT_NEW_ALERT, _alert(f"A{n}"), "a")
+    await hass.async_block_till_done()
+    # One flush fires at most max_events, the most recently queued
+    assert [e.data["identifier"] for e in new] == [f"A{n}" for n in range(30, 50)]
+    assert dispatcher.stats()["pending"] == 30
+
+    # Within the interval: held, and repeated transitions coalesced
+    for _ in range(3):
+        dispatcher.async_queue(EVENT_NEW_ALERT, _alert("B"), "a")
+    dispatcher.async_queue(EVENT_NEW_ALERT, _alert("B"), "b")
+    dispatcher.async_queue(EVENT_NEW_ALERT, _alert("C"), "a")
+    await hass.async_block_till_done()
+    assert len(new) == 20
+
+    # The next flush: the new alerts first, then the backlog
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1.1))
+    await hass.async_block_till_done()
+    assert [e.data["identifier"] for e in new[20:]] == [
+        *(f"A{n}" for n in range(12, 30)),
+        "B",
+        "C",
+    ]
+    assert new[38].data["entry_ids"] == ["a", "b"]
+
+    # Unloading fires what is left
+    dispatcher.async_queue(EVENT_NEW_ALERT, _alert("D"), "a")
+    dispatcher.async_shutdown()
+    await hass.async_block_till_done()
+    assert [e.data["identifier"] for e in new[40:]] == [
+        *(f"A{n}" for n in range(12)),
+        "D",
+    ]
+    assert dispatcher.stats() == {"pending": 0, "fired": 53, "merged": 3}
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.krisinformation.filters import AlertFilter
+from custom_components.krisinformation.models import Alert
+
+NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _alert(identifier: str, msg_type: str = "Alert", **info) -> Alert:
+    info.setdefault("expires", (NOW + timedelta(hours=1)).isoformat())
+    raw = {"identifier": identifier, "msgType": msg_type, "info": [info]}
+    return Alert.from_cap(raw, "sv-SE")
+
+
+def _ids(alert_filter: AlertFilter, alerts: list[Alert]) -> list[str]:
+    return [a.identifier for a in alert_filter.apply(alerts, NOW)]
+
+
+def test_minimum_levels_keep_unranked_values() -> None:
+    alerts = [
+        _alert("minor", severity="Minor", urgency="Future", certainty="Possible"),
+        _alert("severe", severity="Severe", urgency="Immediate", certainty="Likely"),
+        _alert("unknown", severity="Unknown", urgency="Unknown", certainty="Unknown"),
+    ]
+    assert _ids(AlertFilter(), alerts) == ["minor", "severe", "unknown"]
+    assert _ids(AlertFilter(severity_min="Severe"), alerts) == ["severe", "unknown"]
+    assert _ids(AlertFilter(urgency_min="Expected"), alerts) == ["severe", "unknown"]
+    assert _ids(AlertFilter(certainty_min="Observed"), alerts) == ["unknown"]
+
+
+def test_category_msg_type_and_activity() -> None:
+    alerts = [
+        _alert("fire", category="Fire"),
+        _alert("mixed", category=["Met", "Safety"]),
+        _alert("update", "Update", category="Fire"),
+        _alert("expired", category="Fire", expires=(NOW - timedelta(1)).isoformat()),
+        _alert("future", category="Fire", effective=(NOW + timedelta(1)).isoformat()),
+    ]
+    assert _ids(AlertFilter(), alerts) == ["fire", "mixed"]
+    assert _ids(AlertFilter(categories=["Safety"]), alerts) == ["mixed"]
+    fire_and_updates = AlertFilter(include_update_cancel=True, categories=["Fire"])
+    assert _ids(fire_and_updates, alerts) == ["fire", "update"]
+    assert len(AlertFilter(active_only=False).apply(alerts, NOW)) == 4
+
+
+def test_built_from_entry_options() -> None:
+    options = {"severity_min": "Moderate", "urgency": "Immediate", "categories": []}
+    alert_filter = AlertFilter.from_options(options.get)
+    assert alert_filter.excluded_severities == {"Minor"}
+    assert alert_filter.excluded_urgencies == {"Past", "Future", "Expected"}
+    assert alert_filter.excluded_certainties == frozenset()
+    assert alert_filter.excluded_msg_types == {"Update", "Cancel"}
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from custom_components.krisinformation import _get_geocodes
+from custom_components.krisinformation.geo_index import GeoIndex
+from custom_components.krisinformation.hub import KrisinformationFetchHub
+from custom_components.krisinformation.models import Alert
+
+STOCKHOLM_COUNTY = "01"
+STOCKHOLM = "0180"
+UPPSALA = "0380"
+
+
+def _alert(identifier: str, *codes: str) -> Alert:
+    area = [{"geocode": [{"valueName": "Kommun", "value": c}]} for c in codes]
+    return Alert.from_cap(
+        {"identifier": identifier, "info": [{"language": "sv-SE", "area": area}]},
+        "sv-SE",
+    )
+
+
+def test_expand_walks_the_hierarchy() -> None:
+    index = GeoIndex()
+    assert index.expand(frozenset({STOCKHOLM})) == {STOCKHOLM, STOCKHOLM_COUNTY}
+    county = index.expand(frozenset({STOCKHOLM_COUNTY}))
+    assert STOCKHOLM in county and UPPSALA not in county
+    assert index.county_of(UPPSALA) == "03"
+
+
+@pytest.mark.parametrize(
+    ("codes", "expected"),
+    [
+        ((STOCKHOLM,), {"", STOCKHOLM_COUNTY, STOCKHOLM}),
+        ((STOCKHOLM_COUNTY,), {"", STOCKHOLM_COUNTY, STOCKHOLM}),
+        ((UPPSALA,), {"", UPPSALA[:2]}),
+        (("00",), {"", STOCKHOLM_COUNTY, STOCKHOLM, UPPSALA[:2]}),
+        ((), {"", STOCKHOLM_COUNTY, STOCKHOLM, UPPSALA[:2]}),
+    ],
+)
+def test_partition_matches_entry_areas(codes, expected) -> None:
+    buckets = GeoIndex().partition(
+        [_alert("a", *codes)], ["", STOCKHOLM_COUNTY, STOCKHOLM, UPPSALA[:2]]
+    )
+    assert {code for code, alerts in buckets.items() if alerts} == expected
+
+
+def test_entry_areas_become_geocodes() -> None:
+    assert _get_geocodes("Stockholm", ["Uppsala län", "Okänd"]) == {STOCKHOLM, "03"}
+    assert _get_geocodes("Stockholm", "Uppsala, Stockholms län") == {
+        STOCKHOLM,
+        UPPSALA,
+        STOCKHOLM_COUNTY,
+    }
+    assert _get_geocodes("Hela Sverige", ["Uppsala"]) == {""}
+    assert _get_geocodes("Stockholm", ["Hela Sverige"]) == {""}
+
+
+async def test_hub_merges_multi_area_entries(hass) -> None:
+    hub = KrisinformationFetchHub(hass, None, "production")
+    hub._store.replace(
+        [
+            {"identifier": identifier, "info": [{"language": "sv-SE", "area": area}]}
+            for identifier, area in (
+                ("STHLM", [{"geocode": [{"value": STOCKHOLM}]}]),
+                ("BOTH", [{"geocode": [{"value": STOCKHOLM}, {"value": UPPSALA}]}]),
+                ("UPPSALA", [{"geocode": [{"value": UPPSALA}]}]),
+                ("GBG", [{"geocode": [{"value": "1480"}]}]),
+            )
+        ]
+    )
+    commute = frozenset({STOCKHOLM, UPPSALA})
+    hub.attach_entry("commute", hub.poll_bounds, commute)
+
+    alerts = hub.get_area_alerts("sv-SE", commute)
+    # One list, national order, alerts covering both areas only once
+    assert [a.identifier for a in alerts] == ["STHLM", "BOTH", "UPPSALA"]
+    assert hub.get_area_alerts("sv-SE", commute) is alerts
+    uppsala = hub.get_area_alerts("sv-SE", frozenset({UPPSALA}))
+    assert [a.identifier for a in uppsala] == ["BOTH", "UPPSALA"]
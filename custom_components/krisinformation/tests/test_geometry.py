@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from custom_components.krisinformation.geometry import (
+    area_geometry,
+    parse_circle,
+    parse_polygon,
+)
+from custom_components.krisinformation.hub import KrisinformationFetchHub
+from custom_components.krisinformation.models import Alert
+
+# Roughly the island of Gotland, as CAP "lat,lon" pairs
+GOTLAND = "57.9,18.1 57.9,19.3 56.9,18.8 56.9,18.0 57.9,18.1"
+VISBY = (57.64, 18.30)
+STOCKHOLM = (59.33, 18.07)
+STOCKHOLM_CODE = "0180"
+STOCKHOLM_AREA = frozenset({STOCKHOLM_CODE})
+
+
+def _raw(identifier: str, **area) -> dict:
+    return {
+        "identifier": identifier,
+        "info": [{"language": "sv-SE", "area": [area]}],
+    }
+
+
+def test_polygon_and_circle_containment() -> None:
+    polygon = parse_polygon(GOTLAND)
+    assert polygon is not None and len(polygon.points) == 4
+    assert polygon.contains(*VISBY)
+    assert not polygon.contains(*STOCKHOLM)
+    # Inside the bounding box but outside the slanted eastern edge
+    assert not polygon.contains(57.0, 19.2)
+
+    circle = parse_circle("59.33,18.07 10")
+    assert circle is not None
+    assert circle.contains(59.40, 18.07)
+    assert not circle.contains(59.50, 18.07)
+
+
+def test_malformed_geometry_is_ignored() -> None:
+    assert parse_polygon("57.9,18.1 57.9") is None
+    assert parse_polygon("a,b c,d e,f") is None
+    assert parse_circle("59.33,18.07") is None
+    assert parse_circle("59.33,18.07 -1") is None
+    assert area_geometry([{"areaDesc": "Gotland"}]) is None
+
+    geometry = area_geometry(
+        [{"polygon": ["bad", GOTLAND], "circle": "59.33,18.07 10"}]
+    )
+    assert geometry is not None and len(geometry.shapes) == 2
+    assert geometry.contains(*VISBY) and geometry.contains(*STOCKHOLM)
+
+
+def test_alert_parses_geometry_once() -> None:
+    alert = Alert.from_cap(_raw("A", polygon=GOTLAND), "sv-SE")
+    assert alert.geometry is alert.geometry
+    assert Alert.from_cap(_raw("B"), "sv-SE").geometry is None
+
+
+async def test_hub_matches_location(hass) -> None:
+    hub = KrisinformationFetchHub(hass, None, "production")
+    geocode = [{"valueName": "Kommun", "value": STOCKHOLM_CODE}]
+    hub._store.replace(
+        [
+            _raw("GOTLAND", polygon=GOTLAND, geocode=geocode),
+            _raw("CITY", circle="59.33,18.07 5"),
+            _raw("AREA", geocode=geocode),
+            _raw("ELSEWHERE", geocode=[{"valueName": "Kommun", "value": "0380"}]),
+        ]
+    )
+
+    def matched(point) -> list:
+        alerts = hub.get_location_alerts("sv-SE", STOCKHOLM_AREA, *point)
+        return [a.identifier for a in alerts]
+
+    # The geometry decides when present, the area code otherwise
+    assert matched(VISBY) == ["GOTLAND", "AREA"]
+    assert matched(STOCKHOLM) == ["CITY", "AREA"]
+    assert hub.get_location_alerts("sv-SE", STOCKHOLM_AREA, *VISBY) is (
+        hub.get_location_alerts("sv-SE", STOCKHOLM_AREA, *VISBY)
+    )
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_NAME
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.const import (
+    API_ENV_PRODUCTION,
+    API_ENV_TEST,
+    CONF_ACTIVE_ONLY,
+    CONF_API_ENV,
+    CONF_MUNICIPALITY,
+    CONF_SEVERITY_MIN,
+    DOMAIN,
+    HUB_DATA_KEY,
+)
+from custom_components.krisinformation.config_flow import OptionsFlowHandler
+
+from fake_vma import FakeVmaServer
+from load_harness import load_alert
+
+SENSOR = "sensor.krisinformation_hela_sverige"
+
+
+async def _save_options(hass, entry, user_input) -> None:
+    # Home Assistant provides OptionsFlow.config_entry since 2024.11
+    with patch.object(OptionsFlowHandler, "config_entry", entry, create=True):
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        assert result["type"] is FlowResultType.FORM
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input=user_input
+        )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_local_options_apply_without_reload_or_fetch(
+    hass, enable_custom_integrations, socket_enabled
+) -> None:
+    async with FakeVmaServer() as server:
+        server.publish(load_alert("A1"))
+        server.publish(load_alert("A1"), API_ENV_TEST)
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ), patch.object(hub_module, "TEST_BASE_URL", server.url(API_ENV_TEST)):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                version=3,
+                title="Hela Sverige",
+                data={CONF_NAME: "Krisinformation", CONF_MUNICIPALITY: "Hela Sverige"},
+                options={CONF_API_ENV: API_ENV_PRODUCTION, CONF_SEVERITY_MIN: "Minor"},
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION].async_startup_refresh()
+            await hass.async_block_till_done()
+
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            sensor = "sensor.krisinformation_hela_sverige"
+            assert hass.states.get(sensor).state == "1"
+            requests = server.stats.requests
+
+            # Filtering option: same coordinator, no request, entities updated
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.options, CONF_SEVERITY_MIN: "Severe"}
+            )
+            await hass.async_block_till_done()
+            assert hass.data[DOMAIN][entry.entry_id] is coordinator
+            assert server.stats.requests == requests
+            assert hass.states.get(sensor).state == "0"
+
+            # Another API environment needs another hub: reload
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.options, CONF_API_ENV: API_ENV_TEST}
+            )
+            await hass.async_block_till_done()
+            assert hass.data[DOMAIN][entry.entry_id] is not coordinator
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_first_options_save_of_user_entry_does_not_reload(
+    hass, enable_custom_integrations, socket_enabled
+) -> None:
+    async with FakeVmaServer() as server:
+        server.publish(load_alert("A1"))
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            result = await hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": "user"}
+            )
+            result = await hass.config_entries.flow.async_configure(
+                result["flow_id"],
+                user_input={
+                    CONF_NAME: "Krisinformation",
+                    CONF_MUNICIPALITY: "Hela Sverige",
+                    CONF_SEVERITY_MIN: "Severe",
+                },
+            )
+            result = await hass.config_entries.flow.async_configure(
+                result["flow_id"], user_input={}
+            )
+            assert result["type"] is FlowResultType.CREATE_ENTRY
+            entry = result["result"]
+            assert not entry.options
+            await hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION].async_startup_refresh()
+            await hass.async_block_till_done()
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            assert hass.states.get(SENSOR).state == "0"
+
+            # The form starts from the values chosen in the user step and
+            # copies them to options; nothing effective changed
+            await _save_options(hass, entry, {})
+            assert entry.options[CONF_SEVERITY_MIN] == "Severe"
+            assert entry.options[CONF_API_ENV] == API_ENV_PRODUCTION
+            assert hass.data[DOMAIN][entry.entry_id] is coordinator
+            assert hass.states.get(SENSOR).state == "0"
+
+            await _save_options(hass, entry, {CONF_SEVERITY_MIN: "Minor"})
+            assert hass.data[DOMAIN][entry.entry_id] is coordinator
+            assert hass.states.get(SENSOR).state == "1"
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_options_save_of_migrated_entry_keeps_hidden_options(
+    hass, enable_custom_integrations, socket_enabled
+) -> None:
+    async with FakeVmaServer() as server:
+        server.publish(load_alert("A1"))
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                version=1,
+                title="Hela Sverige",
+                data={CONF_NAME: "Krisinformation", CONF_MUNICIPALITY: "Hela Sverige"},
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION].async_startup_refresh()
+            await hass.async_block_till_done()
+            assert entry.version == 3
+            assert CONF_ACTIVE_ONLY in entry.options
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            assert hass.states.get(SENSOR).state == "1"
+
+            # active_only is not on the form; saving must not drop it
+            await _save_options(hass, entry, {CONF_SEVERITY_MIN: "Severe"})
+            assert CONF_ACTIVE_ONLY in entry.options
+            assert hass.data[DOMAIN][entry.entry_id] is coordinator
+            assert hass.states.get(SENSOR).state == "0"
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.http_cache import ValidatorCache
+from fake_vma import FakeVmaServer
+
+URL = "https://vmaapi.sr.se/api/v3/alerts"
+
+
+def test_validators_are_scoped_to_url_and_params() -> None:
+    cache = ValidatorCache(max_entries=2)
+    cache.update(URL, {"since": "a", "x": 1}, 'W/"1"', None)
+    cache.update(URL, {}, None, "Mon, 01 Jan 2024 00:00:00 GMT")
+
+    assert cache.conditional_headers(URL, {"x": "1", "since": "a"}) == {
+        "If-None-Match": 'W/"1"'
+    }
+    assert cache.conditional_headers(URL, {"since": "b"}) == {}
+    assert cache.conditional_headers(URL, None) == {
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"
+    }
+
+    # Least recently used entry goes first
+    cache.update(URL, {"since": "c"}, 'W/"3"', None)
+    assert cache.conditional_headers(URL, {"since": "a", "x": "1"}) == {}
+
+    restored = ValidatorCache()
+    restored.restore(cache.as_list())
+    assert restored.conditional_headers(URL, {"since": "c"}) == {
+        "If-None-Match": 'W/"3"'
+    }
+    assert cache.stats()["hits"] == 2
+
+
+async def test_full_resync_can_be_answered_with_304(
+    hass, socket_enabled, cap_payload
+) -> None:
+    async with FakeVmaServer() as server:
+        server.load(cap_payload(5))
+        with patch.object(hub_module, "PRODUCTION_BASE_URL", server.url()):
+            hub = hub_module.KrisinformationFetchHub(
+                hass, async_get_clientsession(hass), "production"
+            )
+            hub.data = await hub._async_update_data()
+            first_sync = hub._last_full_sync
+
+            hub._last_full_sync = None
+            await hub._async_update_data()
+
+    assert server.stats.statuses == {200: 1, 304: 1}
+    assert hub._last_full_sync is not None and hub._last_full_sync >= first_sync
+    assert hub.validator_stats["not_modified"] == 1
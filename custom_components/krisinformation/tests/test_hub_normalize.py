@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+
+from custom_components.krisinformation.hub import (
+    _decode_alerts,
+    _normalize_incremental,
+    _normalize_languages,
+)
+
+
+def test_decode_alerts_skips_garbage(cap_payload) -> None:
+    payload = cap_payload(3)
+    payload["alerts"].append("not an alert")
+    assert len(_decode_alerts(json.dumps(payload).encode())) == 3
+    assert _decode_alerts(b"") == []
+    assert _decode_alerts(b"[]") == []
+
+
+def test_normalization_reuses_unchanged_alerts(cap_payload) -> None:
+    raw = cap_payload(4)["alerts"]
+    first, objects = _normalize_incremental(raw, "sv-SE", {})
+
+    # A delta replaced one raw alert; the other three keep their objects
+    changed = dict(raw[1])
+    second, _objects = _normalize_incremental(
+        [raw[0], changed, raw[2], raw[3]], "sv-SE", objects
+    )
+    assert [a is b for a, b in zip(first, second)] == [True, False, True, True]
+
+    by_language = _normalize_languages(raw, {"sv-SE", "en-US"}, {"sv-SE": objects})
+    assert by_language["sv-SE"][0] == first
+    assert {a.language for a in by_language["en-US"][0]} == {"en-US"}
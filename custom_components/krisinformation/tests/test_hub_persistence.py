@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_NAME
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.const import (
+    API_ENV_PRODUCTION,
+    CONF_API_ENV,
+    CONF_MUNICIPALITY,
+    DOMAIN,
+    HUB_DATA_KEY,
+    STORAGE_SAVE_DELAY_SECONDS,
+)
+from custom_components.krisinformation.hub import KrisinformationFetchHub
+
+from fake_vma import FakeVmaServer
+from load_harness import load_alert
+
+STORAGE_KEY = f"{DOMAIN}.hub_{API_ENV_PRODUCTION}"
+
+
+async def _flush_saves(hass) -> None:
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY_SECONDS + 1)
+    )
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_hub_cache_round_trip(hass, hass_storage, socket_enabled) -> None:
+    alert = load_alert("A1")
+    async with FakeVmaServer() as server:
+        server.publish(alert)
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            session = async_get_clientsession(hass)
+            hub = KrisinformationFetchHub(hass, session, API_ENV_PRODUCTION)
+            await hub.async_restore()
+            # Full fetch, then the first `since` query learns its validators
+            for _ in range(2):
+                await hub.async_refresh()
+                await _flush_saves(hass)
+
+            stored = hass_storage[STORAGE_KEY]["data"]
+            assert [a["identifier"] for a in stored["store"]["alerts"]] == ["A1"]
+            assert stored["since"] == alert["sent"]
+            assert stored["validators"]
+
+            # Nothing changed on the server: a 304 leaves the store alone
+            with patch.object(hub._persist, "async_delay_save") as save:
+                await hub.async_refresh()
+            assert server.stats.statuses[304] == 1
+            save.assert_not_called()
+
+            # A restarted hub starts from the snapshot and asks conditionally
+            restarted = KrisinformationFetchHub(hass, session, API_ENV_PRODUCTION)
+            await restarted.async_restore()
+            assert [a.identifier for a in restarted.get_alerts("sv-SE")] == ["A1"]
+            with patch.object(restarted._persist, "async_delay_save") as save:
+                await restarted.async_refresh()
+            assert server.stats.statuses[304] == 2
+            save.assert_not_called()
+
+            server.publish(load_alert("A2"))
+            await restarted.async_refresh()
+            await _flush_saves(hass)
+            stored = hass_storage[STORAGE_KEY]["data"]
+            assert {a["identifier"] for a in stored["store"]["alerts"]} == {"A1", "A2"}
+
+            await hub.async_shutdown()
+            await restarted.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_unload_writes_pending_state(
+    hass, hass_storage, enable_custom_integrations, socket_enabled
+) -> None:
+    async with FakeVmaServer() as server:
+        server.publish(load_alert("A1"))
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                version=3,
+                title="Hela Sverige",
+                data={CONF_NAME: "Krisinformation", CONF_MUNICIPALITY: "Hela Sverige"},
+                options={CONF_API_ENV: API_ENV_PRODUCTION},
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION].async_startup_refresh()
+            await hass.async_block_till_done()
+            entry_key = f"{DOMAIN}.entry_{entry.entry_id}"
+            # Both saves are still delayed
+            assert STORAGE_KEY not in hass_storage
+            assert entry_key not in hass_storage
+
+            # Unloading writes them right away, so a reload reads fresh state
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+            assert hass_storage[entry_key]["data"]["seen"] == {"A1": "Alert"}
+            stored = hass_storage[STORAGE_KEY]["data"]
+            assert [a["identifier"] for a in stored["store"]["alerts"]] == ["A1"]
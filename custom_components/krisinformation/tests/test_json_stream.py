@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.json_stream import (
+    AlertArrayParser,
+    AlertStreamError,
+)
+from fake_vma import FakeVmaServer
+
+
+def _parse(body: bytes, chunk_size: int) -> list[dict]:
+    parser = AlertArrayParser()
+    alerts = []
+    for start in range(0, len(body), chunk_size):
+        alerts.extend(parser.feed(body[start : start + chunk_size]))
+    alerts.extend(parser.close())
+    return alerts
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1 << 20])
+def test_parser_matches_json_loads(cap_payload, chunk_size: int) -> None:
+    payload = {"notice": 'tricky "alerts": [1]', **cap_payload(20)}
+    body = json.dumps(payload, ensure_ascii=False, indent=1).encode()
+
+    assert _parse(body, chunk_size) == payload["alerts"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+def test_parser_uses_the_top_level_alerts_member(chunk_size: int) -> None:
+    body = (
+        b'{"meta": {"alerts": [{"identifier": "nested"}]}, "kind": "alerts",'
+        b' "list": [{"alerts": []}], "alerts" : [{"identifier": "a"}],'
+        b' "after": {"alerts": [{"identifier": "late"}]}}'
+    )
+    assert _parse(body, chunk_size) == [{"identifier": "a"}]
+    assert _parse(b'{"meta": {"alerts": [{"identifier": "x"}]}}', chunk_size) == []
+
+
+def test_parser_rejects_truncated_and_invalid_bodies(cap_payload) -> None:
+    body = json.dumps(cap_payload(3)).encode()
+    with pytest.raises(AlertStreamError):
+        _parse(body[:-40], 512)
+    with pytest.raises(AlertStreamError):
+        _parse(b'{"alerts": [{"identifier": "a"}, nope]}', 8)
+    assert _parse(b'{"alerts": []}', 3) == []
+    assert _parse(b"{}", 3) == []
+
+
+def test_parser_skips_non_objects() -> None:
+    body = b'{"alerts": [1, "x\\"]", null, [2, {}], {"identifier": "a"}, 23]}'
+    for chunk_size in (1, 5, len(body)):
+        assert _parse(body, chunk_size) == [{"identifier": "a"}]
+
+
+def test_alert_spanning_many_chunks_is_decoded_once() -> None:
+    area = {"areaDesc": 'Område "A" \\ B', "geocode": [{"value": "0180"}]}
+    alert = {"identifier": "big", "info": [{"area": [area] * 5000}]}
+    body = json.dumps({"alerts": [{"identifier": "a"}, alert]}).encode()
+
+    parser = AlertArrayParser()
+    decoder = parser._decoder
+    calls = 0
+
+    def counting_raw_decode(text, pos):
+        nonlocal calls
+        calls += 1
+        return decoder.raw_decode(text, pos)
+
+    parser._decoder = SimpleNamespace(raw_decode=counting_raw_decode)
+    alerts = []
+    for start in range(0, len(body), 1024):
+        alerts.extend(parser.feed(body[start : start + 1024]))
+    alerts.extend(parser.close())
+
+    assert alerts == [{"identifier": "a"}, alert]
+    # One attempt per element; the cut-off one is then only scanned
+    assert calls == 2
+
+
+def test_streaming_peak_memory_is_below_full_decode(cap_payload) -> None:
+    body = json.dumps(cap_payload(2000)).encode()
+
+    def peak(func) -> int:
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    streamed = peak(lambda: _parse(body, 64 * 1024))
+    buffered = peak(lambda: json.loads(body))
+    assert streamed < buffered
+
+
+@pytest.mark.asyncio
+async def test_hub_streams_and_enforces_max_body(
+    hass, socket_enabled, cap_payload
+) -> None:
+    session = async_get_clientsession(hass)
+    async with FakeVmaServer() as server:
+        server.load(cap_payload(50))
+        with patch.object(hub_module, "PRODUCTION_BASE_URL", server.url()):
+            buffered = hub_module.KrisinformationFetchHub(hass, session, "production")
+            streaming = hub_module.KrisinformationFetchHub(hass, session, "production")
+            streaming.stream_threshold_bytes = 0
+            limited = hub_module.KrisinformationFetchHub(
+                hass, session, "production", max_body_bytes=1000
+            )
+
+            expected = await buffered._async_update_data()
+            assert await streaming._async_update_data() == expected
+            assert streaming.cycle_stats["streamed"]
+            assert not buffered.cycle_stats["streamed"]
+
+            # Past the offload threshold the chunks are parsed off the loop
+            offloaded = hub_module.KrisinformationFetchHub(hass, session, "production")
+            offloaded.stream_threshold_bytes = 0
+            offloaded.offload_threshold_bytes = 0
+            with patch.object(
+                hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+            ) as executor_job:
+                assert await offloaded._async_update_data() == expected
+            jobs = [call.args[0].__name__ for call in executor_job.call_args_list]
+            assert {"feed", "close"} <= set(jobs)
+            with pytest.raises(UpdateFailed):
+                await limited._async_update_data()
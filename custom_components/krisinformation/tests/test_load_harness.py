@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+
+from aiohttp import ClientSession
+import pytest
+
+from fake_vma import FakeVmaServer, Scenario
+from load_harness import load_alert, run_load
+
+heavy = pytest.mark.skipif(
+    not os.environ.get("KRISINFORMATION_LOAD_TEST"),
+    reason="set KRISINFORMATION_LOAD_TEST=1 to run load scenarios",
+)
+
+
+@pytest.mark.asyncio
+async def test_fake_server_validators_since_and_rate_limit(socket_enabled) -> None:
+    async with FakeVmaServer(Scenario(rate_limit_every=4, retry_after=7)) as server:
+        server.publish(load_alert("A1"))
+        async with ClientSession() as session:
+            async with session.get(server.url()) as response:
+                assert response.status == 200
+                etag = response.headers["ETag"]
+                assert len((await response.json())["alerts"]) == 1
+
+            headers = {"If-None-Match": etag}
+            async with session.get(server.url(), headers=headers) as response:
+                assert response.status == 304
+
+            params = {"since": "2999-01-01T00:00:00+00:00"}
+            async with session.get(server.url(), params=params) as response:
+                assert (await response.json())["alerts"] == []
+
+            async with session.get(server.url("test")) as response:
+                assert response.status == 429
+                assert response.headers["Retry-After"] == "7"
+
+    assert server.stats.statuses == {200: 2, 304: 1, 429: 1}
+
+
+@pytest.mark.asyncio
+async def test_load_harness_smoke(hass, enable_custom_integrations, socket_enabled):
+    async with FakeVmaServer() as server:
+        report = await run_load(hass, server, entries=3, polls=3)
+
+    # One startup fetch plus one per poll, shared by all entries
+    assert report.requests == 4
+    assert len(report.latencies) == 3
+    assert report.statuses.get(429) is None
+
+
+@heavy
+@pytest.mark.parametrize(
+    ("scenario", "payload_size"),
+    [
+        (Scenario(), 100),
+        (Scenario(latency=0.2), 100),
+        (Scenario(), 10_000),
+        (Scenario(rate_limit_every=5, retry_after=1), 1_000),
+    ],
+    ids=["baseline", "slow", "huge", "rate-limited"],
+)
+@pytest.mark.asyncio
+async def test_load_scenarios(
+    hass,
+    enable_custom_integrations,
+    socket_enabled,
+    cap_payload,
+    record_property,
+    scenario,
+    payload_size,
+):
+    async with FakeVmaServer(scenario) as server:
+        server.load(cap_payload(payload_size))
+        report = await run_load(hass, server, entries=15, polls=10)
+    record_property("load_report", report.format())
+    record_property("requests_per_second", round(report.requests_per_second, 2))
+    record_property("max_loop_block_ms", round(report.max_loop_block * 1000, 1))
+
+    # Every poll reaches every entry; 429s are retried, never duplicated
+    assert len(report.latencies) == 10
+    assert report.statuses.get(200) == 11
+    assert report.requests == 11 + report.statuses.get(429, 0)
+    # Handling the 10k-alert startup fetch stalls the loop for up to about
+    # a second on a slow machine; anything longer is a regression
+    assert report.max_loop_block < 2
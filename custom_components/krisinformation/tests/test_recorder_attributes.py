@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from homeassistant.helpers.json import json_bytes
+import pytest
+
+from custom_components.krisinformation import KrisinformationDataUpdateCoordinator
+from custom_components.krisinformation.binary_sensor import (
+    KrisinformationActiveBinary,
+)
+from custom_components.krisinformation.models import Alert
+from custom_components.krisinformation.sensor import (
+    KrisinformationCountSensor,
+    KrisinformationSeveritySensor,
+)
+
+
+def _fake_coordinator(alerts: list[Alert]) -> SimpleNamespace:
+    return SimpleNamespace(
+        config={},
+        data={"alerts": alerts},
+        alert_attributes=lambda: [a.as_dict() for a in alerts],
+        alert_summary=lambda: [a.summary() for a in alerts],
+        alert_aggregates=lambda: (
+            KrisinformationDataUpdateCoordinator._alert_aggregates(alerts)
+        ),
+        async_add_listener=lambda *_: lambda: None,
+    )
+
+
+def _recorded_bytes(entity) -> tuple[int, int]:
+    """Return (all attribute bytes, bytes the recorder stores)."""
+    attributes = entity.extra_state_attributes
+    recorded = {
+        key: value
+        for key, value in attributes.items()
+        if key not in entity._unrecorded_attributes
+    }
+    return len(json_bytes(attributes)), len(json_bytes(recorded))
+
+
+@pytest.mark.parametrize(
+    "entity_cls", [KrisinformationCountSensor, KrisinformationActiveBinary]
+)
+def test_full_alert_list_is_not_recorded(entity_cls, cap_payload) -> None:
+    alerts = [Alert.from_cap(a, "sv-SE") for a in cap_payload(50)["alerts"]]
+    entity = entity_cls("entry", _fake_coordinator(alerts))
+
+    full_bytes, recorded_bytes = _recorded_bytes(entity)
+
+    assert "alerts" in entity.extra_state_attributes
+    assert "alerts" in entity._unrecorded_attributes
+    assert "alert_summary" not in entity._unrecorded_attributes
+    # Before: every state change stored `full_bytes`; now only the summary,
+    # about 200 bytes per alert
+    assert recorded_bytes * 5 < full_bytes
+    assert recorded_bytes < 250 * len(alerts)
+
+
+def _alert(identifier: str, sent: str, **info) -> Alert:
+    return Alert.from_cap({"identifier": identifier, "sent": sent, "info": [info]}, "")
+
+
+def test_aggregates_are_precomputed() -> None:
+    alerts = [
+        _alert(
+            "a",
+            "2024-01-01T10:00:00+00:00",
+            severity="Moderate",
+            category="Fire",
+            headline="Brand",
+            expires="2024-01-02T10:00:00+00:00",
+        ),
+        _alert(
+            "b",
+            "2024-01-01T12:00:00+00:00",
+            severity="Severe",
+            category=["Fire", "Env"],
+            headline="Rök",
+            expires="2024-01-01T18:00:00+00:00",
+        ),
+        _alert("c", "2024-01-01T11:00:00+00:00", headline="Test"),
+    ]
+    coordinator = _fake_coordinator(alerts)
+    count = KrisinformationCountSensor("entry", coordinator)
+
+    attributes = count.extra_state_attributes
+    assert attributes["highest_severity"] == "Severe"
+    assert attributes["severity_counts"] == {"Moderate": 1, "Severe": 1, "Unknown": 1}
+    assert attributes["category_counts"] == {"Fire": 2, "Env": 1}
+    assert attributes["next_expiry"] == "2024-01-01T18:00:00+00:00"
+    assert attributes["latest_headline"] == "Rök"
+    assert KrisinformationSeveritySensor("entry", coordinator).native_value == "Severe"
+
+    empty = KrisinformationSeveritySensor("entry", _fake_coordinator([]))
+    assert empty.native_value is None
+    assert empty.extra_state_attributes == {"severity_counts": {}, "next_expiry": None}
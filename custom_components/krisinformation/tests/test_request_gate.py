@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_NAME, STATE_UNAVAILABLE
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.const import (
+    API_ENV_PRODUCTION,
+    CONF_API_ENV,
+    CONF_MUNICIPALITY,
+    DOMAIN,
+    HUB_DATA_KEY,
+)
+from custom_components.krisinformation.request_gate import (
+    BUDGET_BURST,
+    BUDGET_PERIOD_SECONDS,
+    BUDGET_REQUESTS,
+    RequestGate,
+    parse_retry_after,
+)
+
+from fake_vma import FakeVmaServer, Scenario
+from load_harness import load_alert
+
+HOST = "vmaapi.sr.se"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_budget_is_per_environment_and_refills() -> None:
+    clock = FakeClock()
+    gate = RequestGate(clock)
+
+    for _ in range(BUDGET_BURST):
+        assert gate.reserve(HOST, "production") is None
+    wait = gate.reserve(HOST, "production")
+    assert wait is not None and wait > 0
+    # Another environment has its own budget
+    assert gate.reserve(HOST, "test") is None
+
+    clock.now += BUDGET_PERIOD_SECONDS / BUDGET_REQUESTS
+    assert gate.reserve(HOST, "production") is None
+    assert gate.deferred_requests == 1
+
+
+def test_retry_after_blocks_every_environment_on_the_host() -> None:
+    clock = FakeClock()
+    gate = RequestGate(clock)
+    gate.defer(HOST, 120)
+
+    assert gate.reserve(HOST, "production") == 120
+    clock.now += 100
+    assert gate.reserve(HOST, "test") == 20
+    assert gate.reserve("other.example", "test") is None
+    clock.now += 20
+    assert gate.reserve(HOST, "production") is None
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("30") == 30
+    assert parse_retry_after("0") is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_first_poll_publishes_nothing(
+    hass, hass_storage, enable_custom_integrations, socket_enabled
+) -> None:
+    async with FakeVmaServer(Scenario(rate_limit_every=1)) as server:
+        server.publish(load_alert("A1"))
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                version=3,
+                title="Hela Sverige",
+                data={CONF_NAME: "Krisinformation", CONF_MUNICIPALITY: "Hela Sverige"},
+                options={CONF_API_ENV: API_ENV_PRODUCTION},
+            )
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            hub = hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION]
+            await hub.async_startup_refresh()
+            await hass.async_block_till_done()
+
+            # A 429 before anything was fetched is a failure, not "no alerts"
+            assert server.stats.statuses[429] == 1
+            assert hub.data is None
+            assert not hub.last_update_success
+            state = hass.states.get("sensor.krisinformation_hela_sverige")
+            assert state.state == STATE_UNAVAILABLE
+
+            # Deferred by Retry-After: still nothing to publish, no request
+            server.scenario = Scenario()
+            await hub.async_refresh()
+            await hass.async_block_till_done()
+            assert server.stats.requests == 1
+            assert hub.data is None
+            assert f"{DOMAIN}.entry_{entry.entry_id}" not in hass_storage
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
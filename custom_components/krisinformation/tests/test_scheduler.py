@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.krisinformation.hub import KrisinformationFetchHub
+from custom_components.krisinformation.models import Alert
+from custom_components.krisinformation.scheduler import (
+    AdaptivePollScheduler,
+    PollBounds,
+)
+
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _alert(severity: str, msg_type: str = "Alert", sent: datetime = NOW) -> Alert:
+    return Alert.from_cap(
+        {
+            "identifier": "a1",
+            "msgType": msg_type,
+            "sent": sent.isoformat(),
+            "info": [{"language": "sv-SE", "severity": severity}],
+        },
+        "sv-SE",
+    )
+
+
+def test_is_hot_on_severe_or_recent_update() -> None:
+    assert AdaptivePollScheduler.is_hot([_alert("Severe")], NOW)
+    assert AdaptivePollScheduler.is_hot([_alert("Minor", "Update")], NOW)
+    stale = _alert("Minor", "Update", sent=NOW - timedelta(hours=2))
+    assert not AdaptivePollScheduler.is_hot([stale, _alert("Moderate")], NOW)
+
+
+def test_interval_tightens_when_hot_and_decays_when_quiet() -> None:
+    scheduler = AdaptivePollScheduler()
+    scheduler.set_bounds("e1", PollBounds(60, 300, 900))
+    interval = timedelta(seconds=300)
+
+    interval = scheduler.next_interval(interval, hot=True)
+    assert interval.total_seconds() == 60
+
+    interval = scheduler.next_interval(interval, hot=False)
+    assert interval.total_seconds() == 300
+
+    seen = []
+    for _ in range(5):
+        interval = scheduler.next_interval(interval, hot=False)
+        seen.append(interval.total_seconds())
+    assert seen == [450, 675, 900, 900, 900]
+
+
+def test_backoff_recovers_gradually_and_respects_max_age() -> None:
+    scheduler = AdaptivePollScheduler()
+    interval = scheduler.backoff(timedelta(seconds=300), retry_after=None)
+    assert interval.total_seconds() == 600
+
+    interval = scheduler.next_interval(interval, hot=True)
+    assert interval.total_seconds() == 300
+    interval = scheduler.next_interval(interval, hot=True, max_age=120)
+    assert interval.total_seconds() == 150
+    interval = scheduler.next_interval(interval, hot=True, max_age=120)
+    assert interval.total_seconds() == 120
+
+
+def test_most_demanding_entry_wins() -> None:
+    scheduler = AdaptivePollScheduler()
+    scheduler.set_bounds("e1", PollBounds(120, 300, 900))
+    scheduler.set_bounds("e2", PollBounds(60, 600, 600))
+    assert scheduler.bounds == PollBounds(60, 300, 600)
+    scheduler.remove("e2")
+    assert scheduler.bounds == PollBounds(120, 300, 900)
+
+
+def test_fit_applies_changed_bounds_to_the_current_interval() -> None:
+    scheduler = AdaptivePollScheduler()
+    scheduler.set_bounds("e1", PollBounds(60, 120, 200))
+    assert scheduler.fit(timedelta(seconds=900)).total_seconds() == 200
+    assert scheduler.fit(timedelta(seconds=30)).total_seconds() == 120
+    scheduler.next_interval(timedelta(seconds=120), hot=True)
+    assert scheduler.fit(timedelta(seconds=120)).total_seconds() == 60
+
+
+async def test_hub_activity_follows_entry_areas(hass) -> None:
+    hub = KrisinformationFetchHub(hass, None, "production")
+    hub._store.replace(
+        [
+            {
+                "identifier": "GBG",
+                "msgType": "Alert",
+                "sent": datetime.now(timezone.utc).isoformat(),
+                "info": [
+                    {
+                        "language": "sv-SE",
+                        "severity": "Severe",
+                        "area": [{"geocode": [{"value": "1480"}]}],
+                    }
+                ],
+            }
+        ]
+    )
+    stockholm = frozenset({"0180"})
+    hub.attach_entry("sthlm", PollBounds(60, 300, 900), stockholm)
+
+    # A severe alert elsewhere in the country does not speed up polling
+    hub._adapt_interval(None)
+    assert not hub.activity_hot
+    assert hub._interval == timedelta(seconds=450)
+
+    # New bounds from an options change apply before the next poll
+    hub.data = {"alerts": hub._store.alerts()}
+    hub.attach_entry("sthlm", PollBounds(60, 120, 200), stockholm)
+    assert hub._interval == timedelta(seconds=200)
+
+    hub.attach_entry("gbg", PollBounds(60, 120, 200), frozenset({"1480"}))
+    hub._adapt_interval(None)
+    assert hub.activity_hot
+    assert hub._interval == timedelta(seconds=60)
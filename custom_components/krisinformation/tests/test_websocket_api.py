@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from homeassistant.const import CONF_NAME
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.krisinformation import hub as hub_module
+from custom_components.krisinformation.const import (
+    API_ENV_PRODUCTION,
+    CONF_API_ENV,
+    CONF_MUNICIPALITY,
+    DOMAIN,
+    HUB_DATA_KEY,
+    WS_TYPE_ALERTS,
+    WS_TYPE_SUBSCRIBE,
+)
+from custom_components.krisinformation.models import Alert
+
+from fake_vma import FakeVmaServer
+from load_harness import load_alert
+
+SENSOR = "sensor.krisinformation_hela_sverige"
+
+
+async def _setup_entry(hass) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        title="Hela Sverige",
+        data={CONF_NAME: "Krisinformation", CONF_MUNICIPALITY: "Hela Sverige"},
+        options={CONF_API_ENV: API_ENV_PRODUCTION},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION].async_startup_refresh()
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_get_alerts(
+    hass, hass_ws_client, enable_custom_integrations, socket_enabled
+) -> None:
+    async with FakeVmaServer() as server:
+        server.publish(load_alert("A1"))
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            entry = await _setup_entry(hass)
+            client = await hass_ws_client(hass)
+
+            await client.send_json(
+                {"id": 1, "type": WS_TYPE_ALERTS, "entry_id": entry.entry_id}
+            )
+            msg = await client.receive_json()
+            assert msg["success"]
+            assert [a["identifier"] for a in msg["result"]["alerts"]] == ["A1"]
+            assert msg["result"]["alerts"][0]["info"]["headline"] == "Lasttest A1"
+
+            await client.send_json(
+                {"id": 2, "type": WS_TYPE_ALERTS, "entity_id": SENSOR}
+            )
+            msg = await client.receive_json()
+            assert [a["identifier"] for a in msg["result"]["alerts"]] == ["A1"]
+
+            await client.send_json({"id": 3, "type": WS_TYPE_ALERTS, "entry_id": "x"})
+            msg = await client.receive_json()
+            assert not msg["success"]
+            assert msg["error"]["code"] == "not_found"
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_subscribe_pushes_deltas(
+    hass, hass_ws_client, enable_custom_integrations, socket_enabled, freezer
+) -> None:
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    freezer.move_to(now)
+    async with FakeVmaServer() as server:
+        server.publish(load_alert("A1", now))
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            entry = await _setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            client = await hass_ws_client(hass)
+
+            await client.send_json(
+                {"id": 1, "type": WS_TYPE_SUBSCRIBE, "entry_id": entry.entry_id}
+            )
+            assert (await client.receive_json())["success"]
+            snapshot = (await client.receive_json())["event"]
+            assert snapshot["snapshot"] is True
+            assert [a["identifier"] for a in snapshot["added"]] == ["A1"]
+
+            # A new alert from the hub
+            server.publish(load_alert("A2", now))
+            await hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION].async_refresh()
+            event = (await client.receive_json())["event"]
+            assert [a["identifier"] for a in event["added"]] == ["A2"]
+            assert event["updated"] == event["removed"] == []
+
+            # A refresh requested on the entry (update_entity) also pushes
+            # its delta: A1 and A2 expired without a new poll
+            freezer.move_to(now + timedelta(hours=3))
+            await coordinator.async_refresh()
+            event = (await client.receive_json())["event"]
+            assert event["added"] == event["updated"] == []
+            assert sorted(event["removed"]) == ["A1", "A2"]
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+            assert (await client.receive_json())["event"] == {"closed": True}
+
+
+@pytest.mark.asyncio
+async def test_delta_is_built_only_for_subscribers(
+    hass, hass_ws_client, enable_custom_integrations, socket_enabled
+) -> None:
+    async with FakeVmaServer() as server:
+        server.publish(load_alert("A1"))
+        with patch.object(
+            hub_module, "PRODUCTION_BASE_URL", server.url(API_ENV_PRODUCTION)
+        ):
+            entry = await _setup_entry(hass)
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            hub = hass.data[HUB_DATA_KEY][API_ENV_PRODUCTION]
+            as_dict = Alert.as_dict
+            with patch.object(
+                Alert, "as_dict", autospec=True, side_effect=as_dict
+            ) as serialize, patch.object(
+                coordinator, "_alert_delta", wraps=coordinator._alert_delta
+            ) as delta:
+                # No subscriber: no delta, each alert serialized once for
+                # the entity attributes
+                server.publish(load_alert("A2"))
+                await hub.async_refresh()
+                await hass.async_block_till_done()
+                delta.assert_not_called()
+                assert serialize.call_count == 2
+
+                client = await hass_ws_client(hass)
+                await client.send_json(
+                    {"id": 1, "type": WS_TYPE_SUBSCRIBE, "entry_id": entry.entry_id}
+                )
+                assert (await client.receive_json())["success"]
+                await client.receive_json()  # snapshot
+                serialize.reset_mock()
+
+                # Subscribed: the delta reuses the attribute dicts
+                server.publish(load_alert("A3"))
+                await hub.async_refresh()
+                event = (await client.receive_json())["event"]
+                assert [a["identifier"] for a in event["added"]] == ["A3"]
+                delta.assert_called_once()
+                assert serialize.call_count == 3
+
+            assert await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
@@ -0,0 +1,56 @@
+"""Small parsing helpers shared by the hub, alert store and coordinators."""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+_RE_WHITESPACE = re.compile(r"\s+")
+
+
+def sanitize_text(value: Optional[str]) -> Optional[str]:
+    """Normalize text from SR VMA API (CRLF/newlines/odd whitespace)."""
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        # Defensive: keep non-string as-is rather than crashing
+        return value  # type: ignore[return-value]
+
+    # Normalize newlines: CRLF/CR -> LF
+    text = value.replace("\r\n", "\n").replace("\r", "\n")
+
+    # Normalize any whitespace (spaces, tabs, newlines) into a single space
+    # This avoids odd-looking multiline rendering in HA attributes.
+    text = _RE_WHITESPACE.sub(" ", text)
+    return text.strip()
+
+
+def parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp into an aware UTC datetime."""
+    if not value:
+        return None
+    try:
+        # Ensure timezone-aware UTC
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc)
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def area_geocodes(area_list: List[Dict[str, Any]]) -> FrozenSet[str]:
+    """Collect all geocode values from a CAP area list."""
+    codes: Set[str] = set()
+    for area in area_list or []:
+        if not isinstance(area, dict):
+            continue
+        geocodes = area.get("geocode") or []
+        if isinstance(geocodes, (dict, str)):
+            geocodes = [geocodes]
+        for geocode in geocodes:
+            value = geocode.get("value") if isinstance(geocode, dict) else geocode
+            if isinstance(value, str) and value:
+                codes.add(value)
+    return frozenset(codes)
@@ -0,0 +1,119 @@
+"""Websocket commands for on-demand alert details and live alert deltas."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN, WS_TYPE_ALERTS, WS_TYPE_SUBSCRIBE
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, ws_get_alerts)
+    websocket_api.async_register_command(hass, ws_subscribe)
+
+
+@callback
+def _async_get_coordinator(hass: HomeAssistant, msg: dict[str, Any]):
+    """Resolve the entry coordinator from `entry_id` or one of its entities."""
+    entry_id = msg.get("entry_id")
+    if entry_id is None and (entity_id := msg.get("entity_id")):
+        registry_entry = er.async_get(hass).async_get(entity_id)
+        if registry_entry is not None and registry_entry.platform == DOMAIN:
+            entry_id = registry_entry.config_entry_id
+    if entry_id is None:
+        return None
+    return hass.data.get(DOMAIN, {}).get(entry_id)
+
+
+_TARGET_SCHEMA = {
+    vol.Exclusive("entry_id", "target"): str,
+    vol.Exclusive("entity_id", "target"): cv.entity_id,
+}
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): WS_TYPE_ALERTS, **_TARGET_SCHEMA}
+)
+@callback
+def ws_get_alerts(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the full CAP details of an entry's current alerts."""
+    coordinator = _async_get_coordinator(hass, msg)
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return
+    connection.send_result(msg["id"], {"alerts": coordinator.alert_attributes()})
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): WS_TYPE_SUBSCRIBE, **_TARGET_SCHEMA}
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Push an entry's alerts as added/updated/removed deltas.
+
+    The first event is a snapshot with every current alert in `added`. When
+    the entry unloads (e.g. on reload) a final `{"closed": true}` event is
+    sent and the client is expected to subscribe again.
+    """
+    coordinator = _async_get_coordinator(hass, msg)
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return
+
+    @callback
+    def _forward_delta() -> None:
+        delta = coordinator.last_delta
+        if delta is None:
+            # Listener call without a published change (e.g. update error)
+            return
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    @callback
+    def _closed() -> None:
+        remove_listener()
+        connection.subscriptions.pop(msg["id"], None)
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"closed": True})
+        )
+
+    remove_listener = coordinator.async_add_listener(_forward_delta)
+    remove_close = coordinator.async_on_close(_closed)
+
+    @callback
+    def _unsubscribe() -> None:
+        remove_listener()
+        remove_close()
+
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                "snapshot": True,
+                "added": coordinator.alert_attributes(),
+                "updated": [],
+                "removed": [],
+            },
+        )
+    )
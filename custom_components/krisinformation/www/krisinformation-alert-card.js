@@ -189,8 +189,15 @@ class KrisinformationAlertCard extends LitElement {
   setConfig(config) {
     if (!config?.entity) throw new Error('You must specify an entity.');
     const normalized = this._normalizeConfig(config);
+    if (this.config?.entity !== normalized.entity) this._unsubscribeLive();
     this.config = normalized;
     this._expanded = {};
+    this._ensureLiveSubscription();
+  }
+
+  connectedCallback() {
+    super.connectedCallback();
+    this._ensureLiveSubscription();
   }
 
   disconnectedCallback() {
@@ -198,6 +205,88 @@ class KrisinformationAlertCard extends LitElement {
     // Rensa timers för att undvika minnesläckor
     clearTimeout(this._holdTimer);
     clearTimeout(this._tapTimer);
+    clearTimeout(this._liveRetryTimer);
+    this._unsubscribeLive();
+  }
+
+  // Live alert deltas via the integration's `krisinformation/subscribe` websocket
+  // command. While subscribed, the card only does work when alerts change instead
+  // of re-reading the entity attributes on every Home Assistant state change.
+  // Falls back to the `alerts` attribute if the subscription is unavailable.
+  _ensureLiveSubscription() {
+    const entity = this.config?.entity;
+    const conn = this.hass?.connection;
+    if (!entity || !conn || !this.isConnected) return;
+    if (this._liveEntity === entity) return;
+    if (this._liveRetryAt && this._liveRetryEntity === entity && Date.now() < this._liveRetryAt) return;
+
+    this._unsubscribeLive();
+    this._liveEntity = entity;
+    conn
+      .subscribeMessage((msg) => this._onLiveMessage(entity, msg), {
+        type: 'krisinformation/subscribe',
+        entity_id: entity,
+      })
+      .then((unsub) => {
+        if (this._liveEntity !== entity) {
+          this._safeUnsubscribe(unsub);
+          return;
+        }
+        this._liveUnsub = unsub;
+      })
+      .catch(() => {
+        if (this._liveEntity !== entity) return;
+        // Not a Krisinformation entity, entry not loaded yet or older integration
+        this._resetLive();
+        this._liveRetryEntity = entity;
+        this._liveRetryAt = Date.now() + 60000;
+        this.requestUpdate();
+      });
+  }
+
+  _onLiveMessage(entity, msg) {
+    if (this._liveEntity !== entity || !msg) return;
+    if (msg.closed) {
+      // The config entry was reloaded: subscribe again to the new coordinator
+      this._resetLive();
+      clearTimeout(this._liveRetryTimer);
+      this._liveRetryTimer = setTimeout(() => this._ensureLiveSubscription(), 2000);
+      this.requestUpdate();
+      return;
+    }
+    const map = msg.snapshot || !this._liveMap ? new Map() : this._liveMap;
+    for (const raw of [...(msg.added || []), ...(msg.updated || [])]) {
+      if (raw?.identifier == null) continue;
+      const [item] = this._normalizeCapAlerts([raw]);
+      if (item) map.set(raw.identifier, item);
+      else map.delete(raw.identifier);
+    }
+    for (const id of msg.removed || []) map.delete(id);
+    this._liveMap = map;
+    this._liveAlerts = Array.from(map.values());
+    this.requestUpdate();
+  }
+
+  _unsubscribeLive() {
+    this._safeUnsubscribe(this._liveUnsub);
+    this._resetLive();
+  }
+
+  _resetLive() {
+    this._liveUnsub = null;
+    this._liveEntity = null;
+    this._liveMap = null;
+    this._liveAlerts = null;
+  }
+
+  _safeUnsubscribe(unsub) {
+    if (typeof unsub !== 'function') return;
+    try {
+      const result = unsub();
+      if (result && typeof result.catch === 'function') result.catch(() => {});
+    } catch (_) {
+      // already closed by the server
+    }
   }
 
   getCardSize() {
@@ -234,6 +323,7 @@ class KrisinformationAlertCard extends LitElement {
 
   _alerts() {
     if (!this.hass || !this.config) return [];
+    if (this._liveAlerts) return this._liveAlerts;
     const stateObj = this.hass.states?.[this.config.entity];
     const raw = stateObj ? stateObj.attributes?.alerts || [] : [];
     return this._normalizeCapAlerts(Array.isArray(raw) ? raw : []);
@@ -608,6 +698,17 @@ class KrisinformationAlertCard extends LitElement {
   shouldUpdate(changed) {
     if (changed.has('config')) return true;
     if (changed.has('hass')) {
+      this._ensureLiveSubscription();
+      if (this._liveAlerts) {
+        // Alerts arrive as websocket deltas; only header/language depend on hass
+        const stateObj = this.hass?.states?.[this.config?.entity];
+        const hassKey = `${this.hass?.language}|${stateObj?.attributes?.friendly_name}`;
+        if (this._lastHassKey !== hassKey) {
+          this._lastHassKey = hassKey;
+          return true;
+        }
+        return false;
+      }
       const alerts = this._alerts();
       const key = JSON.stringify(
         alerts?.map((m) => [